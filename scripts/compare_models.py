@@ -34,58 +34,56 @@ mlflow.set_tracking_uri(mlflow_tracking_uri)
 print(f"✅ MLflow tracking URI: {mlflow_tracking_uri}")
 
 model_name = os.getenv("MODEL_NAME", "insurance_model")
+# Shared by all calls below, so they reuse one keep-alive connection
 client = MlflowClient()
 
 try:
-    # Try to get latest production model
+    # Fetch the latest Production and Staging versions in a single registry
+    # call and partition them locally by stage
     try:
-        prod_models = client.get_latest_versions(model_name, stages=["Production"])
+        latest_versions = client.get_latest_versions(
+            model_name, stages=["Production", "Staging"]
+        )
     except Exception as e:
-        print(f"⚠️  Could not get production models: {str(e)}")
-        prod_models = []
+        print(f"⚠️  Could not get registered models: {str(e)}")
+        latest_versions = []
+
+    prod_models = [v for v in latest_versions if v.current_stage == "Production"]
+    staging_models = [v for v in latest_versions if v.current_stage == "Staging"]
 
     if not prod_models:
         print("⚠️  No production model found. Will compare staging with latest run.")
         # Get latest staging model as baseline
-        try:
-            staging_models = client.get_latest_versions(model_name, stages=["Staging"])
-            if staging_models:
-                # Use oldest staging as baseline
-                prod_model = staging_models[-1]  # Last one (oldest)
-                prod_run = client.get_run(prod_model.run_id)
-                prod_metrics = prod_run.data.metrics
-                print(f"📊 Using staging model v{prod_model.version} as baseline")
-            else:
-                print(
-                    "❌ No models found in registry. Please train and register a model first."
-                )
-                sys.exit(1)
-        except Exception as e:
-            print(f"❌ Error: {str(e)}")
+        if staging_models:
+            # Use oldest staging as baseline
+            prod_model = staging_models[-1]  # Last one (oldest)
+            print(f"📊 Using staging model v{prod_model.version} as baseline")
+        else:
+            print(
+                "❌ No models found in registry. Please train and register a model first."
+            )
             sys.exit(1)
     else:
         prod_model = prod_models[0]
-        prod_run = client.get_run(prod_model.run_id)
-        prod_metrics = prod_run.data.metrics
         print(f"📊 Production model: v{prod_model.version}")
 
-    # Get latest staging model
-    try:
-        staging_models = client.get_latest_versions(model_name, stages=["Staging"])
-    except Exception as e:
-        print(f"⚠️  Could not get staging models: {str(e)}")
-        staging_models = []
-
     if not staging_models:
         print("❌ No staging model found. Please train and register a model first.")
         sys.exit(1)
 
     # Get the newest staging model (first in list)
     staging_model = staging_models[0]
-    staging_run = client.get_run(staging_model.run_id)
-    staging_metrics = staging_run.data.metrics
     print(f"📊 Staging model: v{staging_model.version}")
 
+    # Fetch metrics once per distinct run (the staging baseline fallback
+    # points both sides at the same run)
+    run_metrics = {
+        run_id: client.get_run(run_id).data.metrics
+        for run_id in {prod_model.run_id, staging_model.run_id}
+    }
+    prod_metrics = run_metrics[prod_model.run_id]
+    staging_metrics = run_metrics[staging_model.run_id]
+
     # Check if comparing same model
     same_model = (
         prod_model.version == staging_model.version
@@ -99,8 +97,8 @@ try:
     # Compare metrics
     metrics_to_compare = ["accuracy", "precision", "recall", "f1_score", "roc_auc"]
 
-    # Generate CML report
-    report = f"""# Model Performance Comparison
+    # Generate CML report (sections collected in a list and joined once)
+    report_parts = [f"""# Model Performance Comparison
 
 ## Model Versions
 - **Production**: v{prod_model.version} (Run: {prod_model.run_id[:8]})
@@ -110,7 +108,7 @@ try:
 
 | Metric | Production | Staging | Change | Status |
 |--------|-----------|---------|--------|--------|
-"""
+"""]
 
     all_improved = True
     any_degraded = False
@@ -140,7 +138,9 @@ try:
 
         sign = "+" if change >= 0 else ""
 
-        report += f"| {metric} | {prod_val:.4f} | {staging_val:.4f} | {sign}{change:.4f} ({sign}{change_pct:.2f}%) | {status} |\n"
+        report_parts.append(
+            f"| {metric} | {prod_val:.4f} | {staging_val:.4f} | {sign}{change:.4f} ({sign}{change_pct:.2f}%) | {status} |\n"
+        )
 
     # Determine recommendation
     if same_model:
@@ -156,7 +156,7 @@ try:
             "➡️  **NO CHANGE**: Staging model performance is equivalent to production."
         )
 
-    report += f"""
+    report_parts.append(f"""
 ## Recommendation
 
 {recommendation}
@@ -172,7 +172,8 @@ try:
 - Version: {staging_model.version}
 - Stage: {staging_model.current_stage}
 - Registered: {staging_model.creation_timestamp}
-"""
+""")
+    report = "".join(report_parts)
 
     # Write report
     with open("cml_report.md", "w") as f:
@@ -0,0 +1,56 @@
+"""
+Fit Preprocessor
+Fits the training ColumnTransformer once on the current processed data and
+saves it with that data's content hash, so retrains on the same data reuse
+it instead of re-fitting the scalers and encoder
+"""
+
+import os
+import sys
+
+import joblib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.training.train import (  # noqa: E402
+    PREPROCESSOR_PATH,
+    Trainer,
+    _file_digest,
+    _load_processed_data,
+    _split_data,
+)
+
+
+def main() -> int:
+    trainer = Trainer()
+    config = trainer.config
+
+    # Fit on the same training split train_model uses, so test rows never
+    # inform the scaling
+    df, processed_data_path = _load_processed_data()
+    X_train, _, _, _ = _split_data(
+        df,
+        config.get("train", {}).get("test_size", 0.2),
+        config.get("train", {}).get("random_state", 42),
+    )
+
+    data_digest = _file_digest(processed_data_path)
+    preprocessor = trainer.create_preprocessor().fit(X_train)
+    # Parallel fitting is not needed once frozen
+    preprocessor.set_params(n_jobs=None)
+
+    os.makedirs(os.path.dirname(PREPROCESSOR_PATH), exist_ok=True)
+    joblib.dump(
+        {
+            "data_digest": data_digest,
+            "model_name": trainer.model_name,
+            "preprocessor": preprocessor,
+        },
+        PREPROCESSOR_PATH,
+    )
+    print(f"✅ Preprocessor saved to {PREPROCESSOR_PATH} (data {data_digest[:8]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,32 +36,29 @@ model_name = os.getenv("MODEL_NAME", "insurance_model")
 client = MlflowClient()
 
 try:
-    # Try to get latest production model
+    # Fetch the latest Production and Staging versions in a single registry call
     try:
-        prod_models = client.get_latest_versions(model_name, stages=["Production"])
+        latest_versions = client.get_latest_versions(
+            model_name, stages=["Production", "Staging"]
+        )
     except Exception as e:
-        # If model registry not available, try staging
-        prod_models = []
-
-    if not prod_models:
-        # Fallback to Staging if no Production model
+        # If stage lookup is unavailable, try to get latest version without stage
+        latest_versions = []
         try:
-            prod_models = client.get_latest_versions(model_name, stages=["Staging"])
-        except Exception as e:
-            # If no staging, try to get latest version without stage
-            try:
-                # Get all versions and use latest
-                all_versions = client.search_model_versions(f"name='{model_name}'")
-                if all_versions:
-                    # Sort by version number (descending) and get latest
-                    sorted_versions = sorted(
-                        all_versions, key=lambda x: int(x.version), reverse=True
-                    )
-                    if sorted_versions:
-                        print(sorted_versions[0].version)
-                        sys.exit(0)
-            except:
-                pass
+            # Get all versions and use latest
+            all_versions = client.search_model_versions(f"name='{model_name}'")
+            if all_versions:
+                # Only the highest version number is needed - single linear pass
+                latest = max(all_versions, key=lambda v: int(v.version))
+                print(latest.version)
+                sys.exit(0)
+        except Exception:
+            pass
+
+    # Prefer Production, fallback to Staging if no Production model
+    prod_models = [v for v in latest_versions if v.current_stage == "Production"] or [
+        v for v in latest_versions if v.current_stage == "Staging"
+    ]
 
     if not prod_models:
         print("No production or staging model found", file=sys.stderr)
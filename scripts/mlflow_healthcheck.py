@@ -0,0 +1,83 @@
+"""
+MLflow Health Check
+Verifies the tracking configuration, server connectivity, and that the
+training experiment exists (creating it if needed)
+"""
+
+import functools
+import os
+import sys
+
+from dotenv import load_dotenv
+
+EXPERIMENT_NAME = "Insurance Model Training"
+
+
+@functools.lru_cache(maxsize=None)
+def _client():
+    """Configure MLflow once and return a shared MlflowClient"""
+    import mlflow
+    from mlflow.tracking import MlflowClient
+
+    mlflow_username = os.getenv("MLFLOW_USERNAME")
+    mlflow_password = os.getenv("MLFLOW_PASSWORD")
+    # Set credentials for Dagshub authentication
+    if mlflow_username and mlflow_password:
+        os.environ["MLFLOW_TRACKING_USERNAME"] = mlflow_username
+        os.environ["MLFLOW_TRACKING_PASSWORD"] = mlflow_password
+
+    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI"))
+    return MlflowClient()
+
+
+def main() -> int:
+    load_dotenv()
+
+    mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+    mlflow_username = os.getenv("MLFLOW_USERNAME")
+    mlflow_password = os.getenv("MLFLOW_PASSWORD")
+
+    print("=== MLflow Configuration ===")
+    print(f"Tracking URI: {mlflow_tracking_uri}")
+    print(f"Username: {mlflow_username}")
+    print(f"Password set: {'Yes' if mlflow_password else 'No'}")
+
+    if not mlflow_tracking_uri:
+        print("\n❌ MLFLOW_TRACKING_URI not set")
+        return 1
+
+    print("\n=== Testing Connection ===")
+    client = _client()
+    try:
+        # A single one-row listing is enough to prove auth and connectivity
+        client.search_experiments(max_results=1)
+        print("✅ Connected!")
+    except Exception as e:
+        print(f"❌ Connection failed: {str(e)}")
+        print("\nPossible issues:")
+        print("1. MLFLOW_PASSWORD not set in .env")
+        print("2. Invalid Dagshub token")
+        print("3. Repository doesn't have MLflow enabled")
+        print("4. Network/authentication issue")
+        return 1
+
+    print("\n=== Checking Experiment ===")
+    try:
+        experiment = client.get_experiment_by_name(EXPERIMENT_NAME)
+        if experiment is None:
+            experiment_id = client.create_experiment(EXPERIMENT_NAME)
+            print(f"✅ Created experiment: {EXPERIMENT_NAME} (ID: {experiment_id})")
+        else:
+            print(
+                f"✅ Experiment exists: {EXPERIMENT_NAME} "
+                f"(ID: {experiment.experiment_id})"
+            )
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""
+File Utilities
+Helpers shared by the data pipeline tasks
+"""
+
+import os
+
+
+def link_latest(src: str, dst: str):
+    """
+    Point dst at src without copying the file
+
+    A hardlink is used where the filesystem supports it, otherwise a
+    relative symlink. Any existing dst is replaced.
+    """
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Filesystem without hardlink support
+        os.symlink(os.path.relpath(src, os.path.dirname(dst)), dst)
@@ -5,11 +5,19 @@ Extracts insurance data from production source (simulates API/data source)
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import hashlib
 import os
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    from .file_utils import link_latest
+except ImportError:
+    # Run as a script (python src/data/<module>.py)
+    from file_utils import link_latest
+
 # Load environment variables
 load_dotenv()
 
@@ -32,6 +40,7 @@ def extract_data(**context):
         # Check if we should use existing production data or generate synthetic
         use_existing = os.getenv("USE_EXISTING_DATA", "true").lower() == "true"
         num_samples = int(os.getenv("NUM_SAMPLES", "100"))
+        seed = os.getenv("SYNTHETIC_DATA_SEED")
 
         if use_existing and os.path.exists("data/production.csv"):
             logger.info("Loading data from existing production.csv file")
@@ -46,7 +55,13 @@ def extract_data(**context):
         else:
             # Generate synthetic insurance data
             logger.info(f"Generating {num_samples} synthetic insurance records")
-            df = _generate_synthetic_insurance_data(num_samples)
+            df = _generate_synthetic_insurance_data(
+                num_samples, seed=int(seed) if seed else None
+            ).to_pandas(split_blocks=True, self_destruct=True)
+
+        # Digest of the extracted rows, taken before the per-run timestamp is
+        # added so downstream caches can recognise repeated content
+        data_digest = _content_digest(df)
 
         # Add extraction timestamp
         df["extraction_timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -60,9 +75,22 @@ def extract_data(**context):
         df.to_csv(output_path, index=False)
         logger.info(f"Data saved to: {output_path}")
 
-        # Also save as 'latest' for quality check and transformation
-        df.to_csv("data/raw/latest_extract.csv", index=False)
-        logger.info(f"Data also saved to: data/raw/latest_extract.csv")
+        # Also expose as 'latest' for quality check and transformation by
+        # linking to the timestamped file instead of serializing it twice
+        latest_path = "data/raw/latest_extract.csv"
+        link_latest(output_path, latest_path)
+        logger.info(f"Data also available at: {latest_path}")
+
+        # Typed Arrow IPC hand-off for downstream tasks (mmap-backed, no re-parse).
+        # Empty strings are stored as nulls, matching how the CSV copy reads back.
+        feather_path = "data/raw/latest_extract.feather"
+        df.replace("", np.nan).to_feather(feather_path)
+        logger.info(f"Data also saved to: {feather_path}")
+
+        ti = context.get("ti")
+        if ti is not None:
+            ti.xcom_push(key="data_path", value=feather_path)
+            ti.xcom_push(key="data_digest", value=data_digest)
 
         logger.info(f"Successfully extracted {len(df)} insurance records")
         logger.info(f"Columns: {list(df.columns)}")
@@ -74,60 +102,84 @@ def extract_data(**context):
         raise
 
 
-def _generate_synthetic_insurance_data(n_samples=100):
+def _content_digest(df: pd.DataFrame) -> str:
+    """Hash of a frame's column names and row values (index ignored)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\x1f".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _generate_synthetic_insurance_data(n_samples=100, seed=None):
     """
     Generate synthetic insurance data matching the production schema
 
     Args:
         n_samples: Number of records to generate
+        seed: Optional seed for reproducible output (fresh entropy if None)
 
     Returns:
-        DataFrame with insurance data
+        pyarrow.Table with insurance data
     """
-    np.random.seed(int(datetime.now().timestamp()) % 2**32)
+    # Local generator: no global state, safe for concurrent DAG runs
+    rng = np.random.default_rng(seed)
 
-    # Generate data matching the insurance schema
-    data = {
-        "id": range(100000, 100000 + n_samples),
-        "Gender": np.random.choice(
-            ["Male", "Female", ""], n_samples, p=[0.5, 0.45, 0.05]
-        ),
-        "Age": np.random.normal(35, 15, n_samples).clip(18, 80),
-        "HasDrivingLicense": np.random.choice([1.0, 0.0], n_samples, p=[0.95, 0.05]),
-        "RegionID": np.random.choice(range(1, 51), n_samples),
-        "Switch": np.random.choice([1.0, 0.0, np.nan], n_samples, p=[0.4, 0.4, 0.2]),
-        "VehicleAge": np.random.choice(
-            ["< 1 Year", "1-2 Year", "> 2 Year", ""],
-            n_samples,
-            p=[0.4, 0.3, 0.25, 0.05],
-        ),
-        "PastAccident": np.random.choice(
-            ["Yes", "No", ""], n_samples, p=[0.3, 0.6, 0.1]
-        ),
-        "AnnualPremium": [
-            f"£{np.random.uniform(100, 5000):,.2f} " for _ in range(n_samples)
-        ],
-        "SalesChannelID": np.random.choice([26, 124, 152, 154, 156, 160], n_samples),
-        "DaysSinceCreated": np.random.randint(1, 365, n_samples),
-        "Result": np.random.choice([0, 1], n_samples, p=[0.7, 0.3]),
-    }
-
-    df = pd.DataFrame(data)
+    # Categorical columns are drawn as dictionary codes; -1 marks a missing value
+    gender = rng.choice(
+        np.array([0, 1, -1], dtype=np.int8), n_samples, p=[0.5, 0.45, 0.05]
+    )
+    vehicle_age = rng.choice(
+        np.array([0, 1, 2, -1], dtype=np.int8), n_samples, p=[0.4, 0.3, 0.25, 0.05]
+    )
+    past_accident = rng.choice(
+        np.array([0, 1, -1], dtype=np.int8), n_samples, p=[0.3, 0.6, 0.1]
+    )
+    switch = rng.choice(
+        np.array([1.0, 0.0, np.nan], dtype=np.float32), n_samples, p=[0.4, 0.4, 0.2]
+    )
 
     # Introduce some missing values
-    missing_indices = np.random.choice(
-        df.index, size=int(n_samples * 0.1), replace=False
+    missing_indices = rng.choice(n_samples, size=int(n_samples * 0.1), replace=False)
+    first, second = len(missing_indices) // 3, 2 * len(missing_indices) // 3
+    gender[missing_indices[:first]] = -1
+    switch[missing_indices[first:second]] = np.nan
+    past_accident[missing_indices[second:]] = -1
+
+    # Generate data matching the insurance schema
+    return pa.table(
+        {
+            "id": np.arange(100000, 100000 + n_samples, dtype=np.int64),
+            "Gender": _dictionary_array(gender, ["Male", "Female"]),
+            "Age": rng.normal(35, 15, n_samples).clip(18, 80).astype(np.float32),
+            "HasDrivingLicense": rng.choice(
+                np.array([1.0, 0.0], dtype=np.float32), n_samples, p=[0.95, 0.05]
+            ),
+            "RegionID": rng.integers(1, 51, n_samples, dtype=np.int16),
+            "Switch": pa.array(switch, from_pandas=True),
+            "VehicleAge": _dictionary_array(
+                vehicle_age, ["< 1 Year", "1-2 Year", "> 2 Year"]
+            ),
+            "PastAccident": _dictionary_array(past_accident, ["Yes", "No"]),
+            # Stored as a plain number; currency formatting is a presentation concern
+            "AnnualPremium": rng.uniform(100, 5000, n_samples)
+            .round(2)
+            .astype(np.float32),
+            "SalesChannelID": rng.choice(
+                np.array([26, 124, 152, 154, 156, 160], dtype=np.int16), n_samples
+            ),
+            "DaysSinceCreated": rng.integers(1, 365, n_samples, dtype=np.int16),
+            "Result": rng.choice(
+                np.array([0, 1], dtype=np.int8), n_samples, p=[0.7, 0.3]
+            ),
+        }
+    )
+
+
+def _dictionary_array(codes, categories):
+    """Build a dictionary-encoded string column; negative codes become nulls."""
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, mask=codes < 0), pa.array(categories)
     )
-    for idx in missing_indices[: len(missing_indices) // 3]:
-        df.loc[idx, "Gender"] = ""
-    for idx in missing_indices[
-        len(missing_indices) // 3 : 2 * len(missing_indices) // 3
-    ]:
-        df.loc[idx, "Switch"] = np.nan
-    for idx in missing_indices[2 * len(missing_indices) // 3 :]:
-        df.loc[idx, "PastAccident"] = ""
-
-    return df
 
 
 # For backward compatibility with existing code
@@ -1,6 +1,6 @@
 """
 Data Profiling Module
-Generates data quality and feature summary reports using ydata-profiling
+Generates data quality and feature summary reports using DuckDB or ydata-profiling
 """
 
 import pandas as pd
@@ -13,7 +13,11 @@ logger = logging.getLogger(__name__)
 
 def generate_data_profile(data_path: str, output_path: str) -> str:
     """
-    Generate a data profiling report using ydata-profiling
+    Generate a data profiling report.
+
+    Scheduled runs use a single-pass DuckDB summary (falling back to pandas
+    describe if DuckDB is unavailable). The full ydata-profiling report is
+    only generated when FULL_PROFILE=1, for manual deep-dives.
 
     Args:
         data_path: Path to the CSV file to profile
@@ -23,26 +27,26 @@ def generate_data_profile(data_path: str, output_path: str) -> str:
         str: Path to the generated report
     """
     try:
-        # Try to import ydata-profiling
-        try:
-            from ydata_profiling import ProfileReport
-
-            use_ydata = True
-        except ImportError:
-            logger.warning("ydata-profiling not available, using basic pandas describe")
-            use_ydata = False
+        use_ydata = os.getenv("FULL_PROFILE", "0") == "1"
+        if use_ydata:
+            # Try to import ydata-profiling
+            try:
+                from ydata_profiling import ProfileReport
+            except ImportError:
+                logger.warning("ydata-profiling not available, using basic summary")
+                use_ydata = False
 
         # Load data
         if not os.path.exists(data_path):
             raise FileNotFoundError(f"Data file not found: {data_path}")
 
-        logger.info(f"Loading data from {data_path}")
-        df = pd.read_csv(data_path)
-
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         if use_ydata:
+            logger.info(f"Loading data from {data_path}")
+            df = pd.read_csv(data_path)
+
             # Generate profile report with ydata-profiling
             logger.info("Generating profile report with ydata-profiling...")
             profile = ProfileReport(
@@ -50,28 +54,61 @@ def generate_data_profile(data_path: str, output_path: str) -> str:
             )
             profile.to_file(output_path)
             logger.info(f"Profile report saved to {output_path}")
+            return output_path
+
+        try:
+            import duckdb
+
+            use_duckdb = True
+        except ImportError:
+            logger.warning("duckdb not available, using basic pandas describe")
+            use_duckdb = False
+
+        if use_duckdb:
+            # Summarize the CSV in a single vectorized pass without loading it into pandas
+            logger.info("Generating summary profile report with DuckDB...")
+            escaped_path = data_path.replace("'", "''")
+            with duckdb.connect() as con:
+                stats = con.execute(
+                    f"SUMMARIZE SELECT * FROM read_csv_auto('{escaped_path}')"
+                ).fetch_df()
+            n_rows = int(stats["count"].iloc[0]) if len(stats) else 0
+            n_cols = len(stats)
+            sections = f"""
+                <h2>Summary Statistics</h2>
+                {stats.drop(columns=["null_percentage"]).to_html(index=False)}
+                <h2>Missing Values</h2>
+                {stats[["column_name", "null_percentage"]].to_html(index=False)}
+            """
         else:
-            # Fallback: Generate a simple HTML report
+            logger.info(f"Loading data from {data_path}")
+            df = pd.read_csv(data_path)
+
             logger.info("Generating basic profile report...")
-            html_content = f"""
-            <html>
-            <head><title>Data Profile Report</title></head>
-            <body>
-                <h1>Data Profile Report</h1>
-                <h2>Dataset Shape</h2>
-                <p>Rows: {len(df)}, Columns: {len(df.columns)}</p>
+            n_rows, n_cols = df.shape
+            sections = f"""
                 <h2>Summary Statistics</h2>
                 {df.describe().to_html()}
                 <h2>Data Types</h2>
                 {df.dtypes.to_frame('Type').to_html()}
                 <h2>Missing Values</h2>
                 {df.isnull().sum().to_frame('Missing Count').to_html()}
+            """
+
+        html_content = f"""
+            <html>
+            <head><title>Data Profile Report</title></head>
+            <body>
+                <h1>Data Profile Report</h1>
+                <h2>Dataset Shape</h2>
+                <p>Rows: {n_rows}, Columns: {n_cols}</p>
+                {sections}
             </body>
             </html>
             """
-            with open(output_path, "w") as f:
-                f.write(html_content)
-            logger.info(f"Basic profile report saved to {output_path}")
+        with open(output_path, "w") as f:
+            f.write(html_content)
+        logger.info(f"Basic profile report saved to {output_path}")
 
         return output_path
 
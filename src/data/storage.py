@@ -3,10 +3,9 @@ Storage Module for saving processed data to cloud storage (S3/MinIO)
 """
 
 import os
+import functools
 import logging
 from datetime import datetime
-import boto3
-from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -15,6 +14,34 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Multipart upload settings: 8 MB parts sent over up to 10 threads
+S3_TRANSFER_SETTINGS = {
+    "multipart_threshold": 8 * 1024 * 1024,
+    "multipart_chunksize": 8 * 1024 * 1024,
+    "max_concurrency": 10,
+    "use_threads": True,
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _get_s3_client(endpoint_url: str, access_key: str, secret_key: str):
+    """Build an S3 client once per endpoint/credentials and reuse it"""
+    # boto3 is only needed for S3/MinIO, so local runs never import it
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint_url,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        config=Config(
+            max_pool_connections=50,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+            tcp_keepalive=True,
+        ),
+    )
+
 
 def save_to_storage(**context) -> str:
     """
@@ -26,16 +53,19 @@ def save_to_storage(**context) -> str:
         storage_type = os.getenv("STORAGE_TYPE", "local")  # 's3', 'minio', 'local'
         bucket_name = os.getenv("STORAGE_BUCKET", "mlops")
 
-        # Local file path
-        local_file = "data/processed/latest.csv"
+        # Local file path; the Parquet copy is column-compressed, so prefer it
+        local_file = "data/processed/latest.parquet"
+        if not os.path.exists(local_file):
+            local_file = "data/processed/latest.csv"
 
         if not os.path.exists(local_file):
             raise FileNotFoundError(f"Processed data file not found: {local_file}")
+        extension = os.path.splitext(local_file)[1]
 
         if storage_type == "local":
             # For local development, just copy to a timestamped location
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dest_path = f"data/processed/archived/{timestamp}_processed.csv"
+            dest_path = f"data/processed/archived/{timestamp}_processed{extension}"
             os.makedirs(os.path.dirname(dest_path), exist_ok=True)
 
             import shutil
@@ -45,6 +75,9 @@ def save_to_storage(**context) -> str:
             return dest_path
 
         elif storage_type in ["s3", "minio"]:
+            from boto3.s3.transfer import TransferConfig
+            from botocore.exceptions import ClientError
+
             # Initialize S3 client (works for both S3 and MinIO)
             endpoint_url = os.getenv("S3_ENDPOINT_URL")
             access_key = os.getenv("AWS_ACCESS_KEY_ID")
@@ -60,12 +93,7 @@ def save_to_storage(**context) -> str:
                 )
 
             logger.info(f"Connecting to {storage_type} at {endpoint_url}")
-            s3_client = boto3.client(
-                "s3",
-                endpoint_url=endpoint_url,
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-            )
+            s3_client = _get_s3_client(endpoint_url, access_key, secret_key)
 
             # Check if bucket exists, create if it doesn't
             try:
@@ -81,10 +109,15 @@ def save_to_storage(**context) -> str:
                     raise
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            s3_key = f"processed/{timestamp}_processed.csv"
+            s3_key = f"processed/{timestamp}_processed{extension}"
 
             logger.info(f"Uploading {local_file} to {bucket_name}/{s3_key}...")
-            s3_client.upload_file(local_file, bucket_name, s3_key)
+            s3_client.upload_file(
+                local_file,
+                bucket_name,
+                s3_key,
+                Config=TransferConfig(**S3_TRANSFER_SETTINGS),
+            )
             logger.info(
                 f"✅ Data uploaded to {storage_type}: s3://{bucket_name}/{s3_key}"
             )
@@ -5,48 +5,91 @@ Transforms raw insurance data through cleaning and feature engineering
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import joblib
 import os
 import logging
 from datetime import datetime
-from sklearn.impute import SimpleImputer
+
+try:
+    from .file_utils import link_latest
+except ImportError:
+    # Run as a script (python src/data/<module>.py)
+    from file_utils import link_latest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Columns not used by the model; dropped by the cleaner and skipped at read time
+DROP_COLUMNS = ["id", "SalesChannelID", "VehicleAge", "DaysSinceCreated"]
+
+# Parse types for numeric insurance columns (nullable, so read as float)
+CSV_DTYPES = {
+    "Age": "float64",
+    "RegionID": "float64",
+    "HasDrivingLicense": "float64",
+    "Switch": "float64",
+}
+
+
+# Most-frequent values used for imputation, reused across runs
+IMPUTATION_MODES_PATH = "data/imputation_modes.pkl"
+
+
 class Cleaner:
-    def __init__(self):
-        self.imputer = SimpleImputer(strategy="most_frequent", missing_values=np.nan)
+    def __init__(self, modes=None):
+        # Column -> imputation value; missing entries are computed on first use
+        self.modes = dict(modes or {})
 
     def clean_data(self, data):
-        data.drop(
-            ["id", "SalesChannelID", "VehicleAge", "DaysSinceCreated"],
-            axis=1,
-            inplace=True,
-        )
-
-        data["AnnualPremium"] = (
-            data["AnnualPremium"]
-            .str.replace("£", "")
-            .str.replace(",", "")
-            .astype(float)
-        )
+        # Dictionary-encoded (categorical) extracts are decoded so the
+        # imputation below can introduce values outside their categories
+        categorical = data.select_dtypes("category").columns
+        data[categorical] = data[categorical].astype(object)
+
+        data.drop(DROP_COLUMNS, axis=1, inplace=True, errors="ignore")
+
+        # Synthetic extracts already carry a numeric premium; only parse
+        # the currency-formatted strings found in production data
+        if not pd.api.types.is_numeric_dtype(data["AnnualPremium"]):
+            data["AnnualPremium"] = (
+                data["AnnualPremium"].str.replace(r"[£,]", "", regex=True).astype(float)
+            )
 
+        # Most-frequent imputation (ties resolve to the smallest value)
         for col in ["Gender", "RegionID"]:
-            data[col] = self.imputer.fit_transform(data[[col]]).flatten()
+            if col not in self.modes:
+                self.modes[col] = data[col].mode(dropna=True).iat[0]
+            data[col] = data[col].fillna(self.modes[col])
 
         data["Age"] = data["Age"].fillna(data["Age"].median())
         data["HasDrivingLicense"] = data["HasDrivingLicense"].fillna(1)
         data["Switch"] = data["Switch"].fillna(-1)
         data["PastAccident"] = data["PastAccident"].fillna("Unknown", inplace=False)
 
-        Q1 = data["AnnualPremium"].quantile(0.25)
-        Q3 = data["AnnualPremium"].quantile(0.75)
+        Q1, Q3 = np.nanpercentile(data["AnnualPremium"].to_numpy(), [25, 75])
         IQR = Q3 - Q1
         upper_bound = Q3 + 1.5 * IQR
-        data = data[data["AnnualPremium"] <= upper_bound]
-
-        return data
+        # Positional take on the kept rows (NaN premiums compare False, as before)
+        keep = data["AnnualPremium"].to_numpy() <= upper_bound
+        data = data.iloc[np.flatnonzero(keep)]
+
+        # Narrow dtypes for the low-cardinality columns. AnnualPremium is cast
+        # to float64 explicitly: synthetic extracts deliver it as float32, and
+        # training reads it as float64 whichever file it loads
+        return data.astype(
+            {
+                "AnnualPremium": "float64",
+                "Age": "int16",
+                "HasDrivingLicense": "int8",
+                "Switch": "int8",
+                "RegionID": "int16",
+                "Gender": "category",
+                "PastAccident": "category",
+            }
+        )
 
 
 def transform_data(**context) -> str:
@@ -62,20 +105,27 @@ def transform_data(**context) -> str:
     """
     try:
         # Determine input file - check for insurance data in raw directory
-        # Priority: production.csv > latest_extract.csv (if it's insurance data)
+        # Priority: production.csv > latest_extract (if it's insurance data)
         input_paths = [
             "data/raw/production.csv",
             "data/production.csv",
+            "data/raw/latest_extract.feather",
             "data/raw/latest_extract.csv",
         ]
 
         input_path = None
+        columns = None
         for path in input_paths:
             if os.path.exists(path):
                 # Check if it's insurance data (has AnnualPremium column)
                 try:
-                    sample = pd.read_csv(path, nrows=1)
-                    if "AnnualPremium" in sample.columns:
+                    if path.endswith(".feather"):
+                        # Feather files carry their schema in the footer
+                        columns = pa.ipc.open_file(path).schema.names
+                    else:
+                        # Streaming reader only parses the first block for the schema
+                        columns = pv.open_csv(path).schema.names
+                    if "AnnualPremium" in columns:
                         input_path = path
                         break
                 except:
@@ -85,6 +135,7 @@ def transform_data(**context) -> str:
             # Fallback to train.csv for testing
             if os.path.exists("data/train.csv"):
                 input_path = "data/train.csv"
+                columns = pv.open_csv(input_path).schema.names
                 logger.warning("Using train.csv as input (no production data found)")
             else:
                 raise FileNotFoundError(
@@ -93,7 +144,19 @@ def transform_data(**context) -> str:
                 )
 
         logger.info(f"Loading data from {input_path}")
-        df = pd.read_csv(input_path)
+        # Columns the cleaner would drop are never materialised
+        usecols = [col for col in columns if col not in DROP_COLUMNS]
+        if input_path.endswith(".feather"):
+            df = pd.read_feather(input_path, columns=usecols)
+        else:
+            # Multithreaded Arrow parser with the numeric columns' types fixed
+            # up front; results stay NumPy-backed for the cleaner
+            df = pd.read_csv(
+                input_path,
+                engine="pyarrow",
+                usecols=usecols,
+                dtype={col: CSV_DTYPES[col] for col in usecols if col in CSV_DTYPES},
+            )
 
         logger.info(f"Original data shape: {df.shape}")
         logger.info(f"Columns: {list(df.columns)}")
@@ -105,13 +168,26 @@ def transform_data(**context) -> str:
                 f"Expected 'AnnualPremium' column but found: {list(df.columns)}"
             )
 
+        # Cleaning needs whole-column statistics (mode, median, quartiles), so
+        # the frame is cleaned in place rather than holding a second copy
+        input_rows, input_cols = df.shape
+
         # Apply transformations
         logger.info("Applying data transformations...")
-        cleaner = Cleaner()
-        df_processed = cleaner.clean_data(df.copy())
+        modes = (
+            joblib.load(IMPUTATION_MODES_PATH)
+            if os.path.exists(IMPUTATION_MODES_PATH)
+            else {}
+        )
+        cleaner = Cleaner(modes)
+        df_processed = cleaner.clean_data(df)
+        del df
+        if cleaner.modes != modes:
+            joblib.dump(cleaner.modes, IMPUTATION_MODES_PATH)
+            logger.info(f"Imputation modes saved to: {IMPUTATION_MODES_PATH}")
 
         logger.info(f"Processed data shape: {df_processed.shape}")
-        logger.info(f"Removed {len(df) - len(df_processed)} rows (outliers)")
+        logger.info(f"Removed {input_rows - len(df_processed)} rows (outliers)")
 
         # Ensure processed directory exists
         os.makedirs("data/processed", exist_ok=True)
@@ -122,16 +198,22 @@ def transform_data(**context) -> str:
         df_processed.to_csv(output_path, index=False)
         logger.info(f"Processed data saved to: {output_path}")
 
-        # Also save as 'latest' for downstream tasks
+        # Also expose as 'latest' for downstream tasks by linking to the
+        # timestamped file instead of serializing it twice
         latest_path = "data/processed/latest.csv"
-        df_processed.to_csv(latest_path, index=False)
-        logger.info(f"Processed data also saved to: {latest_path}")
+        link_latest(output_path, latest_path)
+        logger.info(f"Processed data also available at: {latest_path}")
+
+        # Typed Parquet copy so training and storage keep the narrowed dtypes
+        parquet_path = "data/processed/latest.parquet"
+        df_processed.to_parquet(parquet_path, index=False, compression="zstd")
+        logger.info(f"Processed data also saved to: {parquet_path}")
 
         logger.info(f"✓ Transformation completed successfully")
         logger.info(f"  - Input: {input_path}")
         logger.info(f"  - Output: {latest_path}")
-        logger.info(f"  - Rows: {len(df)} → {len(df_processed)}")
-        logger.info(f"  - Columns: {len(df.columns)} → {len(df_processed.columns)}")
+        logger.info(f"  - Rows: {input_rows} → {len(df_processed)}")
+        logger.info(f"  - Columns: {input_cols} → {len(df_processed.columns)}")
 
         return latest_path
 
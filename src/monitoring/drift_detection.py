@@ -5,9 +5,12 @@ Detects out-of-distribution features in incoming requests
 
 import pandas as pd
 import numpy as np
+import functools
 import logging
 import os
 import joblib
+from dataclasses import dataclass
+from typing import Dict
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,13 +23,56 @@ REFERENCE_STATS = {
 }
 
 
+@functools.lru_cache(maxsize=4)
 def load_reference_stats(stats_path: str = "data/reference_stats.pkl"):
-    """Load reference statistics from training data"""
+    """Load reference statistics from training data (cached per path)"""
     if os.path.exists(stats_path):
         return joblib.load(stats_path)
     return REFERENCE_STATS
 
 
+@dataclass(frozen=True)
+class ReferenceStats:
+    """Reference statistics laid out as one array per statistic"""
+
+    feature_index: Dict[str, int]
+    mean: np.ndarray
+    std: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    @classmethod
+    def from_dict(cls, stats: dict) -> "ReferenceStats":
+        """Build from the {feature: {stat: value}} mapping
+
+        A trailing neutral row (zero std, unbounded range) is appended for
+        features without stats, so they never flag as drift.
+        """
+        rows = list(stats.values()) + [
+            {"mean": 0.0, "std": 0.0, "min": -np.inf, "max": np.inf}
+        ]
+        return cls(
+            feature_index={name: i for i, name in enumerate(stats)},
+            mean=np.array([r["mean"] for r in rows], dtype=np.float64),
+            std=np.array([r["std"] for r in rows], dtype=np.float64),
+            min=np.array([r["min"] for r in rows], dtype=np.float64),
+            max=np.array([r["max"] for r in rows], dtype=np.float64),
+        )
+
+
+@functools.lru_cache(maxsize=4)
+def load_reference_arrays(stats_path: str = "data/reference_stats.pkl"):
+    """Reference statistics as arrays for the vectorized checks (cached per path)"""
+    return ReferenceStats.from_dict(load_reference_stats(stats_path))
+
+
+def reload_reference_stats(stats_path: str = "data/reference_stats.pkl"):
+    """Drop cached reference statistics and load them again from disk"""
+    load_reference_stats.cache_clear()
+    load_reference_arrays.cache_clear()
+    return load_reference_stats(stats_path)
+
+
 def check_feature_drift(
     feature_name: str, value: float, z_threshold: float = 3.0
 ) -> bool:
@@ -70,8 +116,54 @@ def check_feature_drift(
     return is_drift
 
 
+def check_feature_drift_batch(
+    feature_names: list, values: np.ndarray, z_threshold: float = 3.0
+) -> np.ndarray:
+    """
+    Check several features of one sample for drift in a single vectorized pass
+
+    Args:
+        feature_names: Names of the features
+        values: Feature values, aligned with feature_names
+        z_threshold: Z-score threshold for drift detection (default: 3.0 = 3 sigma)
+
+    Returns:
+        np.ndarray: Boolean mask, True where drift is detected
+    """
+    ref = load_reference_arrays()
+    values = np.asarray(values, dtype=np.float64)
+
+    unknown = len(ref.feature_index)
+    idx = np.array(
+        [ref.feature_index.get(name, unknown) for name in feature_names],
+        dtype=np.intp,
+    )
+    for i in np.flatnonzero(idx == unknown):
+        logger.warning(f"No reference stats for feature: {feature_names[i]}")
+
+    mean, std, lo, hi = ref.mean[idx], ref.std[idx], ref.min[idx], ref.max[idx]
+
+    z_scores = np.abs(values - mean) / np.where(std > 0, std, 1.0)
+    z_scores[std <= 0] = 0.0
+    # NaN is never within [min, max], so the scalar rule flags it as drift;
+    # features without stats are exempt, as in check_feature_drift
+    out_of_range = (values < lo) | (values > hi) | (np.isnan(values) & (idx != unknown))
+    is_drift = (z_scores > z_threshold) | out_of_range
+
+    for i in np.flatnonzero(is_drift):
+        logger.warning(
+            f"Drift detected in {feature_names[i]}: value={values[i]}, "
+            f"z_score={z_scores[i]:.2f}, range=[{lo[i]}, {hi[i]}]"
+        )
+
+    return is_drift
+
+
 def calculate_drift_ratio(
-    feature_name: str, values: pd.Series, window_size: int = 100
+    feature_name: str,
+    values: pd.Series,
+    window_size: int = 100,
+    z_threshold: float = 3.0,
 ) -> float:
     """
     Calculate the ratio of drifted values in a sliding window
@@ -80,6 +172,7 @@ def calculate_drift_ratio(
         feature_name: Name of the feature
         values: Series of feature values
         window_size: Size of the sliding window
+        z_threshold: Z-score threshold for drift detection (default: 3.0 = 3 sigma)
 
     Returns:
         float: Ratio of drifted values (0.0 to 1.0)
@@ -87,7 +180,24 @@ def calculate_drift_ratio(
     if len(values) == 0:
         return 0.0
 
-    recent_values = values.tail(window_size)
-    drift_count = sum([check_feature_drift(feature_name, val) for val in recent_values])
+    stats = load_reference_stats()
+
+    if feature_name not in stats:
+        logger.warning(f"No reference stats for feature: {feature_name}")
+        return 0.0
+
+    ref_stats = stats[feature_name]
+    mean, std = ref_stats["mean"], ref_stats["std"]
+    lo, hi = ref_stats["min"], ref_stats["max"]
+
+    # Same rule as check_feature_drift, applied to the whole window at once
+    recent_values = values.tail(window_size).to_numpy(dtype=np.float64, copy=False)
+    if std > 0:
+        z_scores = np.abs((recent_values - mean) / std)
+    else:
+        z_scores = np.zeros_like(recent_values)
+    # NaN fails the scalar range check, so it counts as drift here too
+    out_of_range = (recent_values < lo) | (recent_values > hi) | np.isnan(recent_values)
+    is_drift = (z_scores > z_threshold) | out_of_range
 
-    return drift_count / len(recent_values)
+    return float(is_drift.mean())
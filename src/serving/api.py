@@ -4,13 +4,16 @@ FastAPI Application with Prometheus Metrics and Model Serving
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+import numpy as np
 import pandas as pd
-import mlflow
 import os
+import asyncio
 import logging
+import operator
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from .prometheus import (
     get_metrics,
@@ -19,12 +22,16 @@ from .prometheus import (
     PrometheusMiddleware,
 )
 from .model_loader import load_model_from_mlflow
-from ..monitoring.drift_detection import check_feature_drift
+from ..monitoring.drift_detection import check_feature_drift_batch
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Insurance Model API", version="1.0.0")
+app = FastAPI(
+    title="Insurance Model API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -41,19 +48,44 @@ app.add_middleware(PrometheusMiddleware)
 # Load model at startup
 model = None
 model_version = None
+# Column order the model was fitted on, with the row encoder and dtypes
+# specialized for it (built once at startup)
+feature_columns = None
+row_encoder = None
+column_dtypes = None
+# Whether the model exposes predict_proba (checked once at startup)
+has_predict_proba = False
+
+# Micro-batching for /predict: requests arriving within MAX_WAIT_MS of each
+# other are scored together in one model call of up to MAX_BATCH rows
+MAX_BATCH = int(os.getenv("PREDICT_MAX_BATCH", "64"))
+MAX_WAIT_MS = float(os.getenv("PREDICT_MAX_WAIT_MS", "10"))
+prediction_queue = None
+batch_worker = None
 
 
 @app.on_event("startup")
 async def startup_event():
     """Load model from MLflow on startup"""
-    global model, model_version
+    global model, model_version, feature_columns, has_predict_proba
+    global row_encoder, column_dtypes
+    global prediction_queue, batch_worker
     try:
+        # Deferred so importing the app (workers, docs, tests) skips mlflow
+        import mlflow
+
         mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5001")
         model_name = os.getenv("MODEL_NAME", "insurance_model")
         stage = os.getenv("MODEL_STAGE", "Production")
 
         mlflow.set_tracking_uri(mlflow_tracking_uri)
         model, model_version = load_model_from_mlflow(model_name, stage)
+        feature_columns, row_encoder, column_dtypes = _compile_row_encoder(
+            _input_columns(getattr(model, "feature_names_in_", None))
+        )
+        has_predict_proba = hasattr(model, "predict_proba")
+        prediction_queue = asyncio.Queue()
+        batch_worker = asyncio.create_task(_batch_predictions())
         logger.info(
             f"Model loaded successfully: {model_name} (version: {model_version})"
         )
@@ -72,6 +104,20 @@ class InputData(BaseModel):
     AnnualPremium: float
 
 
+# Features checked for drift on every prediction
+DRIFT_FEATURES = ["AnnualPremium", "Age", "RegionID"]
+
+# Fixed dtypes per input field, so per-request frames skip dtype inference
+INPUT_DTYPES = {
+    name: (
+        np.dtype(object)
+        if field.annotation is str
+        else np.dtype(np.int64 if field.annotation is int else np.float64)
+    )
+    for name, field in InputData.model_fields.items()
+}
+
+
 @app.get("/")
 async def read_root():
     """Root endpoint"""
@@ -100,6 +146,149 @@ async def metrics():
     return get_metrics()
 
 
+def _input_columns(fitted_columns) -> List[str]:
+    """
+    Request columns in the model's fitted order
+
+    Only InputData fields can be supplied per request; fitted columns the
+    API does not receive (e.g. extraction_timestamp, which the pipeline
+    drops as remainder) are skipped, and any remaining fields are appended.
+    """
+    if fitted_columns is None:
+        return list(InputData.model_fields)
+    columns = [col for col in fitted_columns if col in InputData.model_fields]
+    return columns + [col for col in InputData.model_fields if col not in columns]
+
+
+def _compile_row_encoder(columns: List[str]) -> tuple:
+    """
+    Specialize row encoding for a fixed column order
+
+    Columns that are not InputData fields are skipped. Returns the encoded
+    columns, a C-level getter that pulls a row's values out as a tuple in
+    that order, and the matching per-column dtypes.
+    """
+    columns = [col for col in columns if col in INPUT_DTYPES]
+    if len(columns) == 1:
+        getter = operator.itemgetter(columns[0])
+        encoder = lambda row: (getter(row),)  # noqa: E731
+    else:
+        encoder = operator.itemgetter(*columns)
+    return columns, encoder, [INPUT_DTYPES[col] for col in columns]
+
+
+def _encode_row(row: Dict[str, Any]) -> tuple:
+    """
+    Convert a row to typed values in the model's column order
+
+    Raises for values the column dtype cannot hold (e.g. an int overflowing
+    int64), so a bad request fails on its own before it is batched.
+    """
+    return tuple(
+        dtype.type(value) for dtype, value in zip(column_dtypes, row_encoder(row))
+    )
+
+
+def _build_frame(rows: List[tuple]) -> pd.DataFrame:
+    """Build a frame from encoded rows as pre-typed arrays"""
+    values = zip(*rows)
+    return pd.DataFrame(
+        {
+            col: np.array(col_values, dtype=dtype)
+            for col, dtype, col_values in zip(feature_columns, column_dtypes, values)
+        },
+        copy=False,
+    )
+
+
+def _predict_rows(rows: List[tuple]) -> List[tuple]:
+    """Score encoded rows in one model call, returning (class, probability) pairs"""
+    df = _build_frame(rows)
+    if has_predict_proba:
+        # A single predict_proba pass yields both the class and its probability
+        proba = model.predict_proba(df)
+        class_index = proba.argmax(axis=1)
+        probability = proba[np.arange(len(rows)), class_index]
+        return [
+            (int(cls), float(p))
+            for cls, p in zip(model.classes_[class_index], probability)
+        ]
+    return [(int(cls), None) for cls in model.predict(df)]
+
+
+def _predict_each(rows: List[tuple]) -> list:
+    """Score encoded rows one at a time; failed rows yield their exception"""
+    results = []
+    for row in rows:
+        try:
+            results.append(_predict_rows([row])[0])
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _check_drift(input_dict: Dict[str, Any]) -> Dict[str, bool]:
+    """Run and record drift checks for one input row"""
+    features = [feature for feature in DRIFT_FEATURES if feature in input_dict]
+    drift_mask = check_feature_drift_batch(
+        features, np.array([input_dict[feature] for feature in features])
+    )
+    drift_results = {}
+    for feature, is_drift in zip(features, drift_mask.tolist()):
+        drift_results[feature] = is_drift
+        track_data_drift(feature, is_drift)
+    return drift_results
+
+
+def _format_result(prediction: tuple, drift_results: Dict[str, bool]) -> dict:
+    """Shape one prediction and its drift details into the response body"""
+    predicted_class, probability = prediction
+    result = {
+        "predicted_class": predicted_class,
+        "model_version": model_version,
+        "drift_detected": any(drift_results.values()),
+        "drift_details": drift_results,
+    }
+    if probability is not None:
+        result["prediction_probability"] = probability
+    return result
+
+
+async def _batch_predictions():
+    """Drain queued /predict rows and score them in micro-batches"""
+    loop = asyncio.get_running_loop()
+    while True:
+        row, future = await prediction_queue.get()
+        rows, futures = [row], [future]
+        deadline = loop.time() + MAX_WAIT_MS / 1000
+        while len(rows) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                row, future = await asyncio.wait_for(prediction_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            rows.append(row)
+            futures.append(future)
+
+        try:
+            # Scored on a worker thread so the event loop keeps serving requests
+            results = await asyncio.to_thread(_predict_rows, rows)
+        except Exception as e:
+            # Re-score row by row so only the failing request gets the error
+            results = (
+                [e] if len(rows) == 1 else await asyncio.to_thread(_predict_each, rows)
+            )
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
 @app.post("/predict")
 async def predict(input_data: InputData):
     """
@@ -108,39 +297,20 @@ async def predict(input_data: InputData):
     start_time = time.time()
 
     try:
-        # Convert input to DataFrame
         input_dict = input_data.model_dump()
-        df = pd.DataFrame([input_dict.values()], columns=input_dict.keys())
-
-        # Check for data drift
-        drift_results = {}
-        for feature in ["AnnualPremium", "Age", "RegionID"]:
-            if feature in df.columns:
-                is_drift = check_feature_drift(feature, df[feature].iloc[0])
-                drift_results[feature] = is_drift
-                track_data_drift(feature, is_drift)
-
-        # Make prediction
-        prediction = model.predict(df)
-        prediction_proba = (
-            model.predict_proba(df) if hasattr(model, "predict_proba") else None
+
+        # Queue the row for the batch worker and run drift checks concurrently
+        future = asyncio.get_running_loop().create_future()
+        await prediction_queue.put((_encode_row(input_dict), future))
+        drift_results, prediction = await asyncio.gather(
+            asyncio.to_thread(_check_drift, input_dict), future
         )
 
         # Track prediction metrics
         duration = time.time() - start_time
         track_prediction(str(model_version), duration, "success")
 
-        result = {
-            "predicted_class": int(prediction[0]),
-            "model_version": model_version,
-            "drift_detected": any(drift_results.values()),
-            "drift_details": drift_results,
-        }
-
-        if prediction_proba is not None:
-            result["prediction_probability"] = float(prediction_proba[0][prediction[0]])
-
-        return result
+        return _format_result(prediction, drift_results)
 
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
@@ -149,6 +319,43 @@ async def predict(input_data: InputData):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@app.post("/predict_batch")
+async def predict_batch(input_data: List[InputData]):
+    """
+    Batch prediction endpoint: scores all rows in a single model call
+    """
+    start_time = time.time()
+
+    try:
+        if not input_data:
+            return []
+
+        rows = [item.model_dump() for item in input_data]
+        # Drift checks and scoring run concurrently off the event loop
+        drift_results, predictions = await asyncio.gather(
+            asyncio.to_thread(lambda: [_check_drift(row) for row in rows]),
+            asyncio.to_thread(_predict_rows, [_encode_row(row) for row in rows]),
+        )
+
+        # Track prediction metrics (one observation per scored row)
+        duration = time.time() - start_time
+        for _ in rows:
+            track_prediction(str(model_version), duration, "success")
+
+        return [
+            _format_result(prediction, drift)
+            for prediction, drift in zip(predictions, drift_results)
+        ]
+
+    except Exception as e:
+        logger.error(f"Batch prediction error: {str(e)}")
+        duration = time.time() - start_time
+        track_prediction(str(model_version), duration, "error")
+        raise HTTPException(
+            status_code=500, detail=f"Batch prediction failed: {str(e)}"
+        )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -3,19 +3,28 @@ Model Loader Module
 Loads models from MLflow Model Registry
 """
 
-import mlflow
-import mlflow.sklearn
 import logging
 import os
+import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds a loaded model is reused before the registry is asked again
+MODEL_CACHE_TTL = float(os.getenv("MODEL_CACHE_TTL", "60"))
+
+# (model_name, stage) -> (model, model_version, fetched_at)
+_model_cache = {}
+
 
 def load_model_from_mlflow(model_name: str, stage: str = "Production") -> tuple:
     """
     Load model from MLflow Model Registry
 
+    Results are cached per (model_name, stage). Within MODEL_CACHE_TTL no
+    registry call is made; after it, only the version is looked up and the
+    model is downloaded again only if that version changed.
+
     Args:
         model_name: Name of the registered model
         stage: Model stage (Production, Staging, Archived)
@@ -23,15 +32,16 @@ def load_model_from_mlflow(model_name: str, stage: str = "Production") -> tuple:
     Returns:
         tuple: (model, model_version)
     """
-    try:
-        # Construct model URI
-        model_uri = f"models:/{model_name}/{stage}"
+    # Deferred so importing this module does not pull in mlflow
+    import mlflow
+    import mlflow.sklearn
 
-        logger.info(f"Loading model from MLflow: {model_uri}")
-
-        # Load model
-        model = mlflow.sklearn.load_model(model_uri)
+    key = (model_name, stage)
+    cached = _model_cache.get(key)
+    if cached is not None and time.time() - cached[2] < MODEL_CACHE_TTL:
+        return cached[0], cached[1]
 
+    try:
         # Get model version info
         client = mlflow.tracking.MlflowClient()
         latest_version = client.get_latest_versions(model_name, stages=[stage])
@@ -41,8 +51,25 @@ def load_model_from_mlflow(model_name: str, stage: str = "Production") -> tuple:
         else:
             model_version = "unknown"
 
+        if cached is not None and cached[1] == model_version != "unknown":
+            logger.info(f"Model unchanged: {model_name} v{model_version}")
+            _model_cache[key] = (cached[0], model_version, time.time())
+            return cached[0], model_version
+
+        # Construct model URI, pinned to the resolved version when known
+        if model_version != "unknown":
+            model_uri = f"models:/{model_name}/{model_version}"
+        else:
+            model_uri = f"models:/{model_name}/{stage}"
+
+        logger.info(f"Loading model from MLflow: {model_uri}")
+
+        # Load model
+        model = mlflow.sklearn.load_model(model_uri)
+
         logger.info(f"Model loaded successfully: {model_name} v{model_version}")
 
+        _model_cache[key] = (model, model_version, time.time())
         return model, model_version
 
     except Exception as e:
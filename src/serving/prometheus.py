@@ -53,10 +53,27 @@ def get_metrics():
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
+# Endpoint label used for paths that match no route, to bound label cardinality
+OTHER_ENDPOINT = "other"
+
+# Labelled children resolved once per (method, endpoint, status) and reused
+_request_metrics = {}
+
+
 def track_request(method: str, endpoint: str, status_code: int, duration: float):
     """Track API request metrics"""
-    api_request_count.labels(method=method, endpoint=endpoint, status=status_code).inc()
-    api_request_latency.labels(method=method, endpoint=endpoint).observe(duration)
+    key = (method, endpoint, status_code)
+    metrics = _request_metrics.get(key)
+    if metrics is None:
+        metrics = _request_metrics[key] = (
+            api_request_count.labels(
+                method=method, endpoint=endpoint, status=status_code
+            ),
+            api_request_latency.labels(method=method, endpoint=endpoint),
+        )
+    count, latency = metrics
+    count.inc()
+    latency.observe(duration)
 
 
 def track_prediction(model_version: str, duration: float, status: str = "success"):
@@ -88,13 +105,16 @@ class PrometheusMiddleware:
 
         start_time = time.time()
         method = scope["method"]
-        path = scope["path"]
 
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
                 status_code = message["status"]
                 duration = time.time() - start_time
-                track_request(method, path, status_code, duration)
+                # The router records the matched route template on the scope,
+                # so /items/123 is reported as /items/{item_id}
+                route = scope.get("route")
+                endpoint = getattr(route, "path", None) or OTHER_ENDPOINT
+                track_request(method, endpoint, status_code, duration)
             await send(message)
 
         await self.app(scope, receive, send_wrapper)
@@ -4,30 +4,19 @@ Trains models and logs experiments to MLflow (Dagshub)
 """
 
 import os
+import functools
+import hashlib
 import joblib
 import yaml
+import numpy as np
 import pandas as pd
-import mlflow
-import mlflow.sklearn
 import logging
-import subprocess
 import json
+import operator
+import pickle
+import shutil
+import time
 from dotenv import load_dotenv
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    roc_auc_score,
-    precision_score,
-    recall_score,
-    f1_score,
-)
-from sklearn.preprocessing import StandardScaler, OneHotEncoder, MinMaxScaler
-from sklearn.compose import ColumnTransformer
-from imblearn.over_sampling import SMOTE
-from imblearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.tree import DecisionTreeClassifier
 
 # Load environment variables
 load_dotenv()
@@ -35,45 +24,297 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Dtypes of the cleaned data (as written by transformation), so the CSV
+# fallback skips type inference and loads the same narrow columns as Parquet
+PROCESSED_DTYPES = {
+    "Age": "int16",
+    "HasDrivingLicense": "int8",
+    "Switch": "int8",
+    "RegionID": "int16",
+    "AnnualPremium": "float64",
+    "Gender": "category",
+    "PastAccident": "category",
+    "Result": "int8",
+}
+
+# libyaml-backed safe loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# model.pkl compression: lz4 when installed (near-free CPU), zlib otherwise
+try:
+    import lz4  # noqa: F401
+
+    MODEL_COMPRESSION = ("lz4", 3)
+except ImportError:
+    MODEL_COMPRESSION = 3
+
+# Fitted preprocessing/SMOTE outputs are cached here, per DVC data version
+SKLEARN_CACHE_DIR = ".cache/sklearn"
+# Size the cache is trimmed to after each fit (least recently used first)
+SKLEARN_CACHE_BYTES_LIMIT = os.getenv("SKLEARN_CACHE_BYTES_LIMIT", "1G")
+
+# Pre-fitted ColumnTransformer written by scripts/fit_preprocessor.py
+PREPROCESSOR_PATH = "artifacts/preprocessor.joblib"
+
+
+def _dvc_data_hash(dvc_file_path: str = "data.dvc"):
+    """md5 of the DVC-tracked data directory, or None if unversioned"""
+    try:
+        with open(dvc_file_path, "r") as f:
+            outs = (yaml.load(f, Loader=YamlLoader) or {}).get("outs") or []
+    except FileNotFoundError:
+        return None
+    return outs[0].get("md5") if outs else None
+
+
+def _file_digest(path: str) -> str:
+    """Content hash of a file (recomputed only when its size or mtime changes)"""
+    stat = os.stat(path)
+    return _cached_file_digest(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_file_digest(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _prune_sklearn_cache(memory):
+    """
+    Bound the pipeline cache on disk
+
+    Directories for other data versions are removed, and the current one is
+    trimmed to SKLEARN_CACHE_BYTES_LIMIT, since runs on new data under an
+    unchanged data.dvc keep adding entries under the same key.
+    """
+    current = os.path.abspath(memory.location)
+    cache_root = os.path.dirname(current)
+    for name in os.listdir(cache_root):
+        path = os.path.join(cache_root, name)
+        if path != current and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    memory.reduce_size(bytes_limit=SKLEARN_CACHE_BYTES_LIMIT)
+
+
+def _processed_data_path():
+    """Path of the cleaned data, preferring the typed Parquet copy"""
+    processed_data_path = "data/processed/latest.parquet"
+    if not os.path.exists(processed_data_path):
+        processed_data_path = "data/processed/latest.csv"
+    if not os.path.exists(processed_data_path):
+        raise FileNotFoundError(f"Processed data not found: {processed_data_path}")
+    return processed_data_path
+
+
+def _load_processed_data():
+    """Load the cleaned data, preferring the typed Parquet copy"""
+    processed_data_path = _processed_data_path()
+
+    logger.info(f"Loading processed data from {processed_data_path}")
+    if processed_data_path.endswith(".parquet"):
+        df = pd.read_parquet(processed_data_path)
+    else:
+        df = pd.read_csv(processed_data_path, engine="pyarrow", dtype=PROCESSED_DTYPES)
+    logger.info(f"Loaded {len(df)} records")
+    return df, processed_data_path
+
+
+def _split_data(df, test_size, random_state):
+    """Stratified train/test split, returning X_train, X_test, y_train, y_test"""
+    from sklearn.model_selection import train_test_split
+
+    # Separate features and target
+    X = df.drop("Result", axis=1)
+    y = df["Result"]
+
+    # Split row positions (same permutation as splitting the frames) and
+    # take each frame once, instead of having the splitter index X and y
+    train_idx, test_idx = train_test_split(
+        np.arange(len(df)),
+        test_size=test_size,
+        random_state=random_state,
+        stratify=y.to_numpy(),
+    )
+    return X.iloc[train_idx], X.iloc[test_idx], y.iloc[train_idx], y.iloc[test_idx]
+
+
+def _input_example(X):
+    """
+    One-row model input example that MLflow can infer a signature from
+
+    Integer columns (including the narrowed int8/int16 ones) become float
+    to avoid missing value warnings; categoricals become object so they
+    are inferred as strings.
+    """
+    input_example = X.head(1).copy()
+    for col in input_example.select_dtypes(include="integer").columns:
+        input_example[col] = input_example[col].astype("float64")
+    for col in input_example.select_dtypes(include="category").columns:
+        input_example[col] = input_example[col].astype(object)
+    return input_example
+
+
+def _git_commit(git_dir: str = ".git"):
+    """
+    HEAD commit SHA without spawning git
+
+    Prefers GIT_COMMIT (set by CI), then resolves .git/HEAD through loose
+    or packed refs. Returns None if the commit cannot be determined.
+    """
+    commit = os.getenv("GIT_COMMIT")
+    if commit:
+        return commit
+    try:
+        with open(os.path.join(git_dir, "HEAD"), "r") as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            return head  # Detached HEAD holds the SHA itself
+        ref = head[len("ref: ") :]
+        try:
+            with open(os.path.join(git_dir, ref), "r") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            with open(os.path.join(git_dir, "packed-refs"), "r") as f:
+                for line in f:
+                    sha, _, name = line.strip().partition(" ")
+                    if name == ref:
+                        return sha
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return None
+
 
 class Trainer:
-    def __init__(self):
-        self.config = self.load_config()
+    # Parsed config.yml, shared by all instances and train_model()
+    _config = None
+
+    def __init__(self, config=None):
+        # Callers that already parsed config.yml pass it in
+        self.config = config or self.load_config()
         self.model_name = self.config["model"]["name"]
         self.model_params = self.config["model"]["params"]
         self.model_path = self.config["model"]["store_path"]
         self.pipeline = self.create_pipeline()
 
-    def load_config(self):
-        with open("config.yml", "r") as config_file:
-            return yaml.safe_load(config_file)
+    @classmethod
+    def load_config(cls):
+        if cls._config is None:
+            with open("config.yml", "r") as config_file:
+                cls._config = yaml.load(config_file, Loader=YamlLoader)
+        return cls._config
 
-    def create_pipeline(self):
-        preprocessor = ColumnTransformer(
+    def create_preprocessor(self):
+        """Unfitted ColumnTransformer for the model's fixed feature columns"""
+        from sklearn.preprocessing import StandardScaler, OneHotEncoder, MinMaxScaler
+        from sklearn.compose import ColumnTransformer
+
+        return ColumnTransformer(
             transformers=[
                 ("minmax", MinMaxScaler(), ["AnnualPremium"]),
                 ("standardize", StandardScaler(), ["Age", "RegionID"]),
                 (
                     "onehot",
-                    OneHotEncoder(handle_unknown="ignore"),
+                    OneHotEncoder(handle_unknown="ignore", dtype=np.float32),
                     ["Gender", "PastAccident"],
                 ),
-            ]
+            ],
+            # Transformers cover disjoint columns, so fit them in parallel
+            n_jobs=-1,
+            # HistGradientBoostingClassifier only accepts dense input
+            sparse_threshold=(
+                0 if self.model_name == "HistGradientBoostingClassifier" else 0.3
+            ),
         )
 
-        smote = SMOTE(sampling_strategy=1.0)
+    def load_fitted_preprocessor(self):
+        """
+        Pre-fitted preprocessor from PREPROCESSOR_PATH, or None
+
+        Only used when it was fitted on exactly the processed data present
+        now (matched by content hash, since the DAG's dvc add leaves data.dvc
+        unchanged between runs) for the configured model; otherwise the
+        pipeline fits its own.
+        """
+        if not os.path.exists(PREPROCESSOR_PATH):
+            return None
+        saved = joblib.load(PREPROCESSOR_PATH)
+        try:
+            data_digest = _file_digest(_processed_data_path())
+        except FileNotFoundError:
+            return None
+        if (
+            saved.get("data_digest") != data_digest
+            or saved.get("model_name") != self.model_name
+        ):
+            logger.info(f"{PREPROCESSOR_PATH} is stale, fitting the preprocessor")
+            return None
+        return saved["preprocessor"]
+
+    def create_pipeline(self):
+        # Estimator stack is imported here so importing this module stays light
+        from sklearn.preprocessing import FunctionTransformer
+        from sklearn.neighbors import NearestNeighbors
+        from imblearn.over_sampling import SMOTE
+        from imblearn.pipeline import Pipeline
+        from sklearn.ensemble import (
+            RandomForestClassifier,
+            GradientBoostingClassifier,
+            HistGradientBoostingClassifier,
+        )
+        from sklearn.tree import DecisionTreeClassifier
+
+        fitted = self.load_fitted_preprocessor()
+        if fitted is not None:
+            # Frozen: fitting the pipeline only applies its transform
+            preprocessor = FunctionTransformer(fitted.transform, accept_sparse=True)
+        else:
+            preprocessor = self.create_preprocessor()
+
+        # Parallel neighbour search for SMOTE (5 neighbours + the sample itself);
+        # passed as an estimator since SMOTE no longer takes n_jobs directly
+        smote = SMOTE(
+            sampling_strategy=1.0,
+            k_neighbors=NearestNeighbors(n_neighbors=6, n_jobs=-1),
+            random_state=self.config.get("train", {}).get("random_state"),
+        )
 
         model_map = {
             "RandomForestClassifier": RandomForestClassifier,
             "DecisionTreeClassifier": DecisionTreeClassifier,
             "GradientBoostingClassifier": GradientBoostingClassifier,
+            "HistGradientBoostingClassifier": HistGradientBoostingClassifier,
         }
 
         model_class = model_map[self.model_name]
-        model = model_class(**self.model_params)
-
+        params = dict(self.model_params or {})
+        if model_class is RandomForestClassifier:
+            # Trees are fit/predicted in parallel on all cores unless config
+            # sets n_jobs explicitly
+            params.setdefault("n_jobs", -1)
+        model = model_class(**params)
+
+        # Non-final steps are memoized, so retrains on unchanged data skip
+        # re-fitting the preprocessor and re-running SMOTE
+        cache_dir = os.path.join(SKLEARN_CACHE_DIR, _dvc_data_hash() or "unversioned")
         pipeline = Pipeline(
-            [("preprocessor", preprocessor), ("smote", smote), ("model", model)]
+            [
+                ("preprocessor", preprocessor),
+                # SMOTE's neighbour search and tree split scans run on float32;
+                # methodcaller keeps the step picklable without importing src
+                (
+                    "to_float32",
+                    FunctionTransformer(
+                        operator.methodcaller("astype", np.float32, copy=False),
+                        accept_sparse=True,
+                    ),
+                ),
+                ("smote", smote),
+                ("model", model),
+            ],
+            memory=joblib.Memory(location=cache_dir, verbose=0),
         )
 
         return pipeline
@@ -84,12 +325,64 @@ class Trainer:
         return X, y
 
     def train_model(self, X_train, y_train):
+        memory = self.pipeline.memory
         self.pipeline.fit(X_train, y_train)
-
-    def save_model(self):
+        # The cache and parallel preprocessing are training-time concerns;
+        # serving transforms single rows, where worker dispatch costs more
+        self.pipeline.memory = None
+        if memory is not None:
+            _prune_sklearn_cache(memory)
+        if "n_jobs" in self.pipeline.named_steps["preprocessor"].get_params():
+            self.pipeline.set_params(preprocessor__n_jobs=None)
+
+    def version_key(self, data_path):
+        """
+        Key identifying the model a fit on data_path produces, or None
+
+        Combines the content hash of the processed data, the parsed config
+        and the code commit. None unless both SMOTE and the estimator are
+        seeded, since unseeded fits on the same inputs differ.
+        """
+        seeded = (self.model_params or {}).get("random_state") is not None and (
+            self.config.get("train", {}).get("random_state") is not None
+        )
+        commit = _git_commit()
+        if not seeded or commit is None:
+            return None
+        config_digest = hashlib.blake2b(
+            json.dumps(self.config, sort_keys=True, default=str).encode(),
+            digest_size=16,
+        ).hexdigest()
+        return f"{_file_digest(data_path)}:{config_digest}:{commit}"
+
+    def save_model(self, version_key=None):
+        """
+        Dump the fitted pipeline to model.pkl
+
+        When version_key (see Trainer.version_key) matches the one recorded
+        with the existing model.pkl, the write is skipped. Returns whether
+        the model was written.
+        """
         model_file_path = os.path.join(self.model_path, "model.pkl")
+        key_path = model_file_path + ".version"
+        if version_key and os.path.exists(model_file_path):
+            try:
+                with open(key_path, "r") as f:
+                    if f.read().strip() == version_key:
+                        return False
+            except FileNotFoundError:
+                pass
         os.makedirs(self.model_path, exist_ok=True)
-        joblib.dump(self.pipeline, model_file_path)
+        joblib.dump(
+            self.pipeline,
+            model_file_path,
+            compress=MODEL_COMPRESSION,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        if version_key:
+            with open(key_path, "w") as f:
+                f.write(version_key)
+        return True
 
 
 def train_model(**context):
@@ -103,10 +396,27 @@ def train_model(**context):
     Returns:
         str: Model URI in MLflow
     """
+    # Deferred so importing this module (e.g. by the DAG) skips mlflow/sklearn
+    import mlflow
+    import mlflow.sklearn
+    from mlflow.entities import Metric, Param, RunTag
+    from mlflow.exceptions import MlflowException
+    from sklearn.metrics import (
+        accuracy_score,
+        classification_report,
+        roc_auc_score,
+        precision_score,
+        recall_score,
+        f1_score,
+    )
+
     try:
+        # Queue run logging on a background thread so training never waits on
+        # the tracking server; the queue is drained when the run ends
+        mlflow.config.enable_async_logging(True)
+
         # Load configuration
-        with open("config.yml", "r") as f:
-            config = yaml.safe_load(f)
+        config = Trainer.load_config()
 
         # Set up MLflow tracking
         mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
@@ -157,77 +467,66 @@ def train_model(**context):
                 raise
 
         # Load processed data
-        processed_data_path = "data/processed/latest.csv"
-        if not os.path.exists(processed_data_path):
-            raise FileNotFoundError(f"Processed data not found: {processed_data_path}")
-
-        logger.info(f"Loading processed data from {processed_data_path}")
-        df = pd.read_csv(processed_data_path)
-        logger.info(f"Loaded {len(df)} records")
-
-        # Separate features and target
-        X = df.drop("Result", axis=1)
-        y = df["Result"]
+        df, processed_data_path = _load_processed_data()
 
         # Split data
         test_size = config.get("train", {}).get("test_size", 0.2)
         random_state = config.get("train", {}).get("random_state", 42)
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state, stratify=y
-        )
+        X_train, X_test, y_train, y_test = _split_data(df, test_size, random_state)
         logger.info(f"Train set: {len(X_train)}, Test set: {len(X_test)}")
 
         # Start MLflow run
         with mlflow.start_run() as run:
             # Initialize trainer
-            trainer = Trainer()
-
-            # Log parameters
-            mlflow.log_params(trainer.model_params)
-            mlflow.log_param("model_name", trainer.model_name)
-            mlflow.log_param("test_size", test_size)
-            mlflow.log_param("random_state", random_state)
-            mlflow.log_param("train_samples", len(X_train))
-            mlflow.log_param("test_samples", len(X_test))
-
-            # Log tags
-            mlflow.set_tag("model_type", trainer.model_name)
-            mlflow.set_tag(
-                "preprocessing", "StandardScaler, MinMaxScaler, OneHotEncoder, SMOTE"
+            trainer = Trainer(config=config)
+            # One client for all direct tracking/registry calls in this run
+            client = mlflow.tracking.MlflowClient()
+
+            # Params and tags are collected here and sent to the tracking
+            # server in one log_batch request before training starts
+            params = dict(trainer.model_params or {})
+            params.update(
+                {
+                    "model_name": trainer.model_name,
+                    "test_size": test_size,
+                    "random_state": random_state,
+                    "train_samples": len(X_train),
+                    "test_samples": len(X_test),
+                }
             )
-            mlflow.set_tag("data_source", "processed/latest.csv")
+            tags = {
+                "model_type": trainer.model_name,
+                "preprocessing": "StandardScaler, MinMaxScaler, OneHotEncoder, SMOTE",
+                "data_source": os.path.relpath(processed_data_path, "data"),
+            }
 
             # Step II-3: DVC+MLflow Lineage - Track dataset version
             try:
                 # Get git commit hash
-                git_commit = (
-                    subprocess.check_output(
-                        ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
-                    )
-                    .decode()
-                    .strip()
-                )
-                mlflow.set_tag("git_commit", git_commit)
-                logger.info(f"Logged git commit: {git_commit[:8]}")
+                git_commit = _git_commit()
+                if git_commit:
+                    tags["git_commit"] = git_commit
+                    logger.info(f"Logged git commit: {git_commit[:8]}")
+                else:
+                    logger.warning("Could not determine git commit")
 
                 # Get DVC directory hash (entire data directory is tracked)
                 dvc_file_path = "data.dvc"
                 if os.path.exists(dvc_file_path):
                     with open(dvc_file_path, "r") as f:
-                        dvc_data = yaml.safe_load(f)
+                        dvc_data = yaml.load(f, Loader=YamlLoader)
                         if "outs" in dvc_data and len(dvc_data["outs"]) > 0:
                             # Get the hash for the entire data directory
                             dvc_hash = dvc_data["outs"][0].get("md5", "unknown")
                             dvc_size = dvc_data["outs"][0].get("size", 0)
                             dvc_nfiles = dvc_data["outs"][0].get("nfiles", 0)
 
-                            mlflow.set_tag("dvc_data_hash", dvc_hash)
-                            mlflow.set_tag("dvc_data_path", "data/")
-                            mlflow.set_tag("dvc_data_size", str(dvc_size))
-                            mlflow.set_tag("dvc_data_nfiles", str(dvc_nfiles))
-                            mlflow.log_param(
-                                "dvc_data_hash", dvc_hash
-                            )  # Also as param for searchability
+                            tags["dvc_data_hash"] = dvc_hash
+                            tags["dvc_data_path"] = "data/"
+                            tags["dvc_data_size"] = str(dvc_size)
+                            tags["dvc_data_nfiles"] = str(dvc_nfiles)
+                            # Also as param for searchability
+                            params["dvc_data_hash"] = dvc_hash
 
                             logger.info(
                                 f"Logged DVC data directory hash: {dvc_hash[:8]}... "
@@ -240,17 +539,28 @@ def train_model(**context):
             except Exception as e:
                 logger.warning(f"Could not get DVC/Git lineage info: {str(e)}")
 
+            # Logged before fitting so a run that fails still records its
+            # params and lineage
+            client.log_batch(
+                run.info.run_id,
+                params=[Param(key, str(value)) for key, value in params.items()],
+                tags=[RunTag(key, str(value)) for key, value in tags.items()],
+                synchronous=False,
+            )
+
             # Train model
             logger.info(f"Training {trainer.model_name}...")
             trainer.train_model(X_train, y_train)
 
-            # Make predictions
-            y_pred = trainer.pipeline.predict(X_test)
-            y_pred_proba = (
-                trainer.pipeline.predict_proba(X_test)[:, 1]
-                if hasattr(trainer.pipeline, "predict_proba")
-                else None
-            )
+            # Make predictions; one predict_proba pass yields both the labels
+            # (argmax, as predict does) and the positive-class scores
+            if hasattr(trainer.pipeline, "predict_proba"):
+                proba = trainer.pipeline.predict_proba(X_test)
+                y_pred = trainer.pipeline.classes_[np.argmax(proba, axis=1)]
+                y_pred_proba = proba[:, 1]
+            else:
+                y_pred = trainer.pipeline.predict(X_test)
+                y_pred_proba = None
 
             # Calculate metrics
             accuracy = accuracy_score(y_test, y_pred)
@@ -263,27 +573,40 @@ def train_model(**context):
                 else roc_auc_score(y_test, y_pred)
             )
 
-            # Log metrics
-            mlflow.log_metric("accuracy", accuracy)
-            mlflow.log_metric("precision", precision)
-            mlflow.log_metric("recall", recall)
-            mlflow.log_metric("f1_score", f1)
-            mlflow.log_metric("roc_auc", roc_auc)
+            # Log all metrics in a second round trip
+            metrics = {
+                "accuracy": accuracy,
+                "precision": precision,
+                "recall": recall,
+                "f1_score": f1,
+                "roc_auc": roc_auc,
+            }
+            # Per-class scores from the classification report are logged as
+            # flat metrics (e.g. cls_1_recall, cls_macro_avg_f1-score)
+            class_report = classification_report(y_test, y_pred, output_dict=True)
+            for cls, scores in class_report.items():
+                if isinstance(scores, dict):
+                    cls = str(cls).replace(" ", "_")
+                    for metric, value in scores.items():
+                        if isinstance(value, (int, float)):
+                            metrics[f"cls_{cls}_{metric}"] = value
+            timestamp = int(time.time() * 1000)
+            client.log_batch(
+                run.info.run_id,
+                metrics=[
+                    Metric(key, float(value), timestamp, 0)
+                    for key, value in metrics.items()
+                ],
+                synchronous=False,
+            )
 
             logger.info(
                 f"Metrics - Accuracy: {accuracy:.4f}, ROC-AUC: {roc_auc:.4f}, F1: {f1:.4f}"
             )
 
-            # Log classification report
-            class_report = classification_report(y_test, y_pred, output_dict=True)
-            mlflow.log_dict(class_report, "classification_report.json")
-
             # Log model (workaround for Dagshub - use artifact logging)
             # Use a sample that represents the actual data types (convert int to float to avoid schema warnings)
-            input_example = X_train.head(1).copy()
-            # Convert integer columns to float to avoid missing value warnings
-            for col in input_example.select_dtypes(include=["int64", "int32"]).columns:
-                input_example[col] = input_example[col].astype("float64")
+            input_example = _input_example(X_train)
 
             try:
                 # Try standard log_model first
@@ -310,24 +633,39 @@ def train_model(**context):
                     mlflow.log_artifacts(model_path, artifact_path="model")
                 logger.info("Model logged as artifact successfully")
 
-            # Save model locally as well
-            trainer.save_model()
-            logger.info(f"Model saved to {trainer.model_path}")
+            # Save model locally as well, unless this exact fit is already there
+            if trainer.save_model(trainer.version_key(processed_data_path)):
+                logger.info(f"Model saved to {trainer.model_path}")
+            else:
+                logger.info(
+                    f"Model in {trainer.model_path} already matches this data, "
+                    "config and commit"
+                )
 
             # Step II-4: Model Registration (MLflow Model Registry)
             model_uri = f"runs:/{run.info.run_id}/model"
             model_name = "insurance_model"
 
             try:
-                # Register model in MLflow Model Registry
+                # Register model in MLflow Model Registry, pointing the version
+                # straight at the logged artifacts (no runs:/ re-resolution and
+                # no polling for READY as mlflow.register_model does)
                 logger.info(f"Registering model: {model_name} from {model_uri}")
-                model_version = mlflow.register_model(model_uri, model_name)
+                try:
+                    client.create_registered_model(model_name)
+                except MlflowException as e:
+                    if e.error_code != "RESOURCE_ALREADY_EXISTS":
+                        raise
+                model_version = client.create_model_version(
+                    name=model_name,
+                    source=f"{run.info.artifact_uri}/model",
+                    run_id=run.info.run_id,
+                )
                 logger.info(
                     f"✅ Model registered: {model_name} v{model_version.version}"
                 )
 
                 # Transition to Staging stage
-                client = mlflow.tracking.MlflowClient()
                 client.transition_model_version_stage(
                     name=model_name, version=model_version.version, stage="Staging"
                 )
@@ -335,10 +673,14 @@ def train_model(**context):
                     f"✅ Model {model_name} v{model_version.version} transitioned to Staging"
                 )
 
-                # Log model registry info as tags
-                mlflow.set_tag("model_registered", "true")
-                mlflow.set_tag("model_version", str(model_version.version))
-                mlflow.set_tag("model_stage", "Staging")
+                # Log model registry info as tags (one batched request)
+                mlflow.set_tags(
+                    {
+                        "model_registered": "true",
+                        "model_version": str(model_version.version),
+                        "model_stage": "Staging",
+                    }
+                )
 
             except Exception as e:
                 # Dagshub may not support model registry - log warning but continue
@@ -348,10 +690,12 @@ def train_model(**context):
                 logger.info(
                     f"Model artifact logged at: {model_uri}. View in Dagshub MLflow UI."
                 )
-                mlflow.set_tag("model_registered", "false")
-                mlflow.set_tag(
-                    "registration_error", str(e)[:100]
-                )  # Truncate long errors
+                mlflow.set_tags(
+                    {
+                        "model_registered": "false",
+                        "registration_error": str(e)[:100],  # Truncate long errors
+                    }
+                )
 
             logger.info(f"✅ Training completed. Run ID: {run.info.run_id}")
             logger.info(f"Model URI: {model_uri}")
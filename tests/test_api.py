@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.serving import api
+
+# Sample request body
+@pytest.fixture
+def sample_row():
+    return {
+        'Gender': 'Male',
+        'Age': 35,
+        'HasDrivingLicense': 1,
+        'RegionID': 28.0,
+        'Switch': 0,
+        'PastAccident': 'No',
+        'AnnualPremium': 1200.0,
+    }
+
+# Pipeline fitted like the training pipeline on synthetic extracts, which
+# carry an extraction_timestamp column the ColumnTransformer drops
+@pytest.fixture
+def served_model(sample_row):
+    train = pd.DataFrame([sample_row] * 4)
+    train['Age'] = [25, 35, 45, 55]
+    train['Gender'] = ['Male', 'Female', 'Male', 'Female']
+    train['extraction_timestamp'] = '2024-01-01T00:00:00'
+    pipeline = Pipeline([
+        ('preprocessor', ColumnTransformer([
+            ('standardize', StandardScaler(), ['Age', 'RegionID']),
+            ('onehot', OneHotEncoder(handle_unknown='ignore'), ['Gender']),
+        ])),
+        ('model', LogisticRegression()),
+    ]).fit(train, [0, 1, 0, 1])
+
+    # Same wiring as startup_event
+    api.model = pipeline
+    api.model_version = '1'
+    api.feature_columns, api.row_encoder, api.column_dtypes = api._compile_row_encoder(
+        api._input_columns(pipeline.feature_names_in_)
+    )
+    api.has_predict_proba = True
+    return pipeline
+
+def test_input_columns_skips_fields_not_in_request():
+    fitted = ['Age', 'Gender', 'extraction_timestamp', 'AnnualPremium']
+    columns = api._input_columns(np.array(fitted, dtype=object))
+
+    # Fitted order first, unknown columns skipped, remaining fields appended
+    assert columns[:3] == ['Age', 'Gender', 'AnnualPremium']
+    assert 'extraction_timestamp' not in columns
+    assert set(columns) == set(api.InputData.model_fields)
+
+def test_predict_rows_with_remainder_column(served_model, sample_row):
+    rows = [sample_row, dict(sample_row, Age=55)]
+    predictions = api._predict_rows([api._encode_row(row) for row in rows])
+
+    assert len(predictions) == 2
+    for predicted_class, probability in predictions:
+        assert predicted_class in (0, 1)
+        assert 0.0 <= probability <= 1.0
+
+def test_row_encoder_skips_unknown_columns(sample_row):
+    columns, encoder, dtypes = api._compile_row_encoder(
+        ['Age', 'extraction_timestamp', 'Gender']
+    )
+
+    assert columns == ['Age', 'Gender']
+    assert encoder(sample_row) == (35, 'Male')
+    assert dtypes == [np.dtype(np.int64), np.dtype(object)]
+
+def test_encode_row_rejects_overflowing_values(served_model, sample_row):
+    with pytest.raises(OverflowError):
+        api._encode_row(dict(sample_row, Age=10**30))
+
+def test_failing_row_does_not_fail_its_batch(served_model, sample_row, monkeypatch):
+    # Rows queued within the wait window are scored in one batch; the NaN
+    # row makes that batch call fail
+    monkeypatch.setattr(api, 'MAX_WAIT_MS', 200)
+    rows = [dict(sample_row, Age=age) for age in (25, 35, 45, 55, 65)]
+    rows.insert(2, dict(sample_row, RegionID=float('nan')))
+
+    async def run_batch():
+        api.prediction_queue = asyncio.Queue()
+        worker = asyncio.create_task(api._batch_predictions())
+        loop = asyncio.get_running_loop()
+        futures = []
+        for row in rows:
+            future = loop.create_future()
+            await api.prediction_queue.put((api._encode_row(row), future))
+            futures.append(future)
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        worker.cancel()
+        return results
+
+    results = asyncio.run(run_batch())
+
+    assert isinstance(results[2], ValueError)
+    good = results[:2] + results[3:]
+    assert all(isinstance(result, tuple) for result in good)
+    assert good == api._predict_rows([api._encode_row(row) for row in rows[:2] + rows[3:]])
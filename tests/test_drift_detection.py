@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.monitoring import drift_detection
+from src.monitoring.drift_detection import (
+    calculate_drift_ratio,
+    check_feature_drift,
+    check_feature_drift_batch,
+)
+
+# Run against the built-in REFERENCE_STATS rather than a local stats file
+@pytest.fixture(autouse=True)
+def default_reference_stats(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    drift_detection.reload_reference_stats()
+    yield
+    drift_detection.reload_reference_stats()
+
+@pytest.mark.parametrize('feature,value', [
+    ('AnnualPremium', 1500.0),
+    ('AnnualPremium', 3200.0),   # > 3 sigma, within range
+    ('AnnualPremium', -1.0),     # below min
+    ('Age', 101.0),              # above max
+    ('Age', np.nan),
+    ('RegionID', np.inf),
+    ('VehicleAge', 1e9),         # no reference stats
+    ('VehicleAge', np.nan),
+])
+def test_batch_matches_scalar_check(feature, value):
+    mask = check_feature_drift_batch([feature], np.array([value]))
+
+    assert mask.tolist() == [check_feature_drift(feature, value)]
+
+def test_batch_checks_features_independently():
+    features = ['AnnualPremium', 'Age', 'RegionID']
+    values = np.array([1500.0, np.nan, 50.0])
+
+    assert check_feature_drift_batch(features, values).tolist() == [False, True, False]
+
+def test_drift_ratio_matches_scalar_check():
+    values = pd.Series([1500.0, 6000.0, np.nan, -5.0, 1400.0, 3200.0])
+
+    expected = np.mean([check_feature_drift('AnnualPremium', v) for v in values])
+    assert calculate_drift_ratio('AnnualPremium', values) == pytest.approx(expected)
+    assert calculate_drift_ratio('AnnualPremium', values) == pytest.approx(4 / 6)
+
+def test_drift_ratio_uses_window_tail():
+    values = pd.Series([np.nan] * 10 + [1500.0] * 5)
+
+    assert calculate_drift_ratio('AnnualPremium', values, window_size=5) == 0.0
+    assert calculate_drift_ratio('VehicleAge', values) == 0.0
+    assert calculate_drift_ratio('AnnualPremium', pd.Series([], dtype=float)) == 0.0
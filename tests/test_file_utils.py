@@ -0,0 +1,33 @@
+import os
+
+from src.data.file_utils import link_latest
+
+def test_link_latest_replaces_existing_target(tmp_path):
+    first = tmp_path / 'extract_1.csv'
+    second = tmp_path / 'extract_2.csv'
+    latest = tmp_path / 'latest.csv'
+    first.write_text('a\n1\n')
+    second.write_text('a\n2\n')
+
+    link_latest(str(first), str(latest))
+    assert latest.read_text() == 'a\n1\n'
+
+    link_latest(str(second), str(latest))
+    assert latest.read_text() == 'a\n2\n'
+    # Linked, not copied
+    assert os.path.samefile(latest, second)
+
+def test_link_latest_falls_back_to_symlink(tmp_path, monkeypatch):
+    source = tmp_path / 'extract.csv'
+    latest = tmp_path / 'latest.csv'
+    source.write_text('a\n1\n')
+
+    def no_hardlinks(src, dst):
+        raise OSError('hardlinks not supported')
+
+    monkeypatch.setattr(os, 'link', no_hardlinks)
+    link_latest(str(source), str(latest))
+
+    assert latest.is_symlink()
+    assert os.readlink(latest) == 'extract.csv'
+    assert latest.read_text() == 'a\n1\n'
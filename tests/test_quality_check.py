@@ -0,0 +1,129 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.data import quality_check
+from src.data.ingestion import extract_data
+from src.data.quality_check import validate_data_quality
+
+# Minimal stand-in for the Airflow task instance passing XComs between tasks
+class FakeTaskInstance:
+    def __init__(self, data_path=None):
+        self.xcoms = {'data_path': data_path}
+
+    def xcom_push(self, key, value):
+        self.xcoms[key] = value
+
+    def xcom_pull(self, task_ids, key):
+        return self.xcoms.get(key)
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # The quality gate resolves data/raw relative to the working directory
+    (tmp_path / "data" / "raw").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def write_stock_csv(path, tz_suffix, rows=60):
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=rows)
+    lines = ["timestamp,open,high,low,close,volume"]
+    for i in range(rows):
+        ts = (start + timedelta(hours=i)).replace(tzinfo=None).isoformat()
+        lines.append(f"{ts}{tz_suffix},1.0,2.0,0.5,1.5,100")
+    path.write_text("\n".join(lines) + "\n")
+
+@pytest.mark.parametrize("tz_suffix", ["", "Z", "+00:00"])
+def test_stock_freshness_with_naive_and_aware_timestamps(workdir, tz_suffix):
+    data_path = workdir / "data" / "raw" / "stock.csv"
+    write_stock_csv(data_path, tz_suffix)
+
+    assert validate_data_quality(ti=FakeTaskInstance(str(data_path))) is True
+
+def write_insurance_csv(path, premiums):
+    lines = ["AnnualPremium,Age,RegionID,Gender,PastAccident,HasDrivingLicense"]
+    for i, premium in enumerate(premiums):
+        lines.append(f'"{premium}",{20 + i % 50},{i % 40},Male,No,1')
+    path.write_text("\n".join(lines) + "\n")
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Force many record batches so counts must accumulate across blocks
+    monkeypatch.setattr(quality_check, "CSV_BLOCK_SIZE", 1 << 10)
+
+def test_insurance_streaming_passes(workdir, small_blocks):
+    data_path = workdir / "data" / "raw" / "production.csv"
+    write_insurance_csv(data_path, ["£1,200"] * 500)
+
+    assert validate_data_quality(ti=FakeTaskInstance(str(data_path))) is True
+
+def test_insurance_nulls_counted_across_blocks(workdir, small_blocks):
+    # 2% missing premiums (empty strings), spread over the whole file
+    premiums = ["" if i % 50 == 0 else "£1,200" for i in range(1000)]
+    data_path = workdir / "data" / "raw" / "production.csv"
+    write_insurance_csv(data_path, premiums)
+
+    with pytest.raises(ValueError, match="AnnualPremium has 2.00% null values"):
+        validate_data_quality(ti=FakeTaskInstance(str(data_path)))
+
+def test_non_numeric_column_fails(workdir, small_blocks):
+    data_path = workdir / "data" / "raw" / "production.csv"
+    write_insurance_csv(data_path, ["£1,200"] * 500)
+    lines = data_path.read_text().splitlines()
+    # Non-numeric RegionID in the last block only
+    lines[-1] = '"£1,200",30,north,Male,No,1'
+    data_path.write_text("\n".join(lines) + "\n")
+
+    with pytest.raises(ValueError, match="RegionID cannot be converted to numeric"):
+        validate_data_quality(ti=FakeTaskInstance(str(data_path)))
+
+def test_non_numeric_column_in_first_block_fails(workdir):
+    data_path = workdir / "data" / "raw" / "production.csv"
+    write_insurance_csv(data_path, ["£1,200"] * 100)
+    lines = data_path.read_text().splitlines()
+    lines[1] = '"£1,200",thirty,3,Male,No,1'
+    data_path.write_text("\n".join(lines) + "\n")
+
+    with pytest.raises(ValueError, match="Age cannot be converted to numeric"):
+        validate_data_quality(ti=FakeTaskInstance(str(data_path)))
+
+def test_passing_extract_is_cached(workdir, monkeypatch):
+    data_path = workdir / "data" / "raw" / "production.csv"
+    write_insurance_csv(data_path, ["£1,200"] * 100)
+    ti = FakeTaskInstance(str(data_path))
+
+    assert validate_data_quality(ti=ti) is True
+    assert (workdir / quality_check.PASSED_HASH_PATH).exists()
+    # Same bytes: the checks are skipped (the file is no longer even parsed)
+    monkeypatch.setattr(quality_check, "_read_schema", None)
+    assert validate_data_quality(ti=ti) is True
+
+def test_repeated_extract_content_is_cached(workdir, monkeypatch):
+    monkeypatch.setenv("USE_EXISTING_DATA", "false")
+    monkeypatch.setenv("SYNTHETIC_DATA_SEED", "7")
+
+    first = FakeTaskInstance()
+    extract_data(ti=first)
+    assert validate_data_quality(ti=first) is True
+
+    # Same rows under a new extraction_timestamp: the files differ, the
+    # content digest does not, so the gate is skipped
+    second = FakeTaskInstance()
+    extract_data(ti=second)
+    assert second.xcoms["data_digest"] == first.xcoms["data_digest"]
+    monkeypatch.setattr(quality_check, "_read_schema", None)
+    assert validate_data_quality(ti=second) is True
+
+def test_changed_extract_content_is_checked(workdir, monkeypatch):
+    monkeypatch.setenv("USE_EXISTING_DATA", "false")
+    monkeypatch.setenv("SYNTHETIC_DATA_SEED", "7")
+    first = FakeTaskInstance()
+    extract_data(ti=first)
+    assert validate_data_quality(ti=first) is True
+
+    monkeypatch.setenv("SYNTHETIC_DATA_SEED", "8")
+    second = FakeTaskInstance()
+    extract_data(ti=second)
+    assert second.xcoms["data_digest"] != first.xcoms["data_digest"]
+    # New content is checked again and recorded as the last passing digest
+    assert validate_data_quality(ti=second) is True
+    passed = (workdir / quality_check.PASSED_HASH_PATH).read_text()
+    assert passed == second.xcoms["data_digest"]
@@ -0,0 +1,193 @@
+import pytest
+import joblib
+import yaml
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from runpy import run_path
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import FunctionTransformer
+
+from src.training import train
+from src.training.train import (
+    Trainer,
+    _git_commit,
+    _input_example,
+    _prune_sklearn_cache,
+)
+
+# Processed features as handed over in latest.parquet (narrowed dtypes)
+@pytest.fixture
+def processed_features():
+    return pd.DataFrame({
+        'Gender': pd.Series(['Male', 'Female'], dtype='category'),
+        'Age': pd.Series([30, 45], dtype='int16'),
+        'HasDrivingLicense': pd.Series([1, 1], dtype='int8'),
+        'RegionID': pd.Series([28, 3], dtype='int16'),
+        'Switch': pd.Series([0, -1], dtype='int8'),
+        'PastAccident': pd.Series(['No', 'Yes'], dtype='category'),
+        'AnnualPremium': [1200.0, 2500.0],
+    })
+
+def test_input_example_dtypes(processed_features):
+    input_example = _input_example(processed_features)
+
+    assert len(input_example) == 1
+    for col in ['Age', 'HasDrivingLicense', 'RegionID', 'Switch']:
+        assert input_example[col].dtype == 'float64'
+    for col in ['Gender', 'PastAccident']:
+        assert input_example[col].dtype == object
+    # The training frame itself is left untouched
+    assert processed_features['Gender'].dtype == 'category'
+
+def test_input_example_signature(processed_features):
+    models = pytest.importorskip('mlflow.models')
+
+    signature = models.infer_signature(_input_example(processed_features))
+
+    input_types = {spec.name: spec.type.name for spec in signature.inputs.inputs}
+    assert input_types['Gender'] == 'string'
+    assert input_types['Age'] == 'double'
+
+def test_prune_sklearn_cache(tmp_path, monkeypatch):
+    stale = tmp_path / 'old-data-hash'
+    stale.mkdir()
+    (stale / 'entry.pkl').write_bytes(b'x' * 1024)
+    memory = joblib.Memory(location=str(tmp_path / 'current-hash'), verbose=0)
+
+    # Each distinct call stores a ~800 KB array in the cache
+    cached_ones = memory.cache(lambda n: np.ones(100_000) * n)
+    for n in range(3):
+        cached_ones(n)
+
+    monkeypatch.setattr(train, 'SKLEARN_CACHE_BYTES_LIMIT', '1M')
+    _prune_sklearn_cache(memory)
+
+    # Other data versions are removed, the current one is trimmed to the limit
+    assert not stale.exists()
+    assert (tmp_path / 'current-hash').exists()
+    size = sum(f.stat().st_size for f in (tmp_path / 'current-hash').rglob('*') if f.is_file())
+    assert size <= 1024 * 1024
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / 'scripts'
+
+SHA = '0123456789abcdef0123456789abcdef01234567'
+
+@pytest.fixture
+def git_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv('GIT_COMMIT', raising=False)
+    (tmp_path / 'refs' / 'heads').mkdir(parents=True)
+    (tmp_path / 'HEAD').write_text('ref: refs/heads/main\n')
+    return tmp_path
+
+def test_git_commit_prefers_env(git_dir, monkeypatch):
+    monkeypatch.setenv('GIT_COMMIT', 'from-ci')
+
+    assert _git_commit(str(git_dir)) == 'from-ci'
+
+def test_git_commit_loose_ref(git_dir):
+    (git_dir / 'refs' / 'heads' / 'main').write_text(SHA + '\n')
+
+    assert _git_commit(str(git_dir)) == SHA
+
+def test_git_commit_packed_ref(git_dir):
+    (git_dir / 'packed-refs').write_text(
+        '# pack-refs with: peeled fully-peeled sorted\n'
+        f'{"f" * 40} refs/heads/other\n'
+        f'{SHA} refs/heads/main\n'
+    )
+
+    assert _git_commit(str(git_dir)) == SHA
+
+def test_git_commit_detached_head(git_dir):
+    (git_dir / 'HEAD').write_text(SHA + '\n')
+
+    assert _git_commit(str(git_dir)) == SHA
+
+def test_git_commit_unknown(git_dir, tmp_path):
+    # Branch without any commit yet, and no repository at all
+    assert _git_commit(str(git_dir)) is None
+    assert _git_commit(str(tmp_path / 'missing')) is None
+
+def make_config(model_params):
+    return {
+        'train': {'test_size': 0.2, 'random_state': 42},
+        'model': {
+            'name': 'DecisionTreeClassifier',
+            'params': model_params,
+            'store_path': 'models/',
+        },
+    }
+
+@pytest.fixture
+def training_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GIT_COMMIT', SHA)
+    data_path = tmp_path / 'latest.csv'
+    data_path.write_text('Age,Result\n30,0\n')
+    return data_path
+
+def test_version_key_requires_seeded_estimator(training_dir):
+    unseeded = Trainer(config=make_config({'max_depth': 3}))
+
+    assert unseeded.version_key(str(training_dir)) is None
+
+def test_version_key_tracks_data_config_and_commit(training_dir, monkeypatch):
+    trainer = Trainer(config=make_config({'random_state': 0}))
+    key = trainer.version_key(str(training_dir))
+
+    assert key is not None
+    assert trainer.version_key(str(training_dir)) == key
+
+    other_config = Trainer(config=make_config({'random_state': 0, 'max_depth': 3}))
+    assert other_config.version_key(str(training_dir)) != key
+
+    monkeypatch.setenv('GIT_COMMIT', 'f' * 40)
+    assert trainer.version_key(str(training_dir)) != key
+    monkeypatch.setenv('GIT_COMMIT', SHA)
+
+    # New rows under the same path (as after each daily transform)
+    training_dir.write_text('Age,Result\n30,0\n45,1\n')
+    assert trainer.version_key(str(training_dir)) != key
+
+def test_save_model_skips_only_matching_key(training_dir):
+    trainer = Trainer(config=make_config({'random_state': 0}))
+
+    assert trainer.save_model('key-1') is True
+    assert trainer.save_model('key-1') is False
+    assert trainer.save_model('key-2') is True
+    assert trainer.save_model(None) is True
+
+def write_processed_data(path, n_rows):
+    rng = np.random.default_rng(n_rows)
+    pd.DataFrame({
+        'Gender': rng.choice(['Male', 'Female'], n_rows),
+        'Age': rng.integers(18, 80, n_rows),
+        'HasDrivingLicense': 1,
+        'RegionID': rng.integers(1, 50, n_rows),
+        'Switch': rng.choice([0, 1, -1], n_rows),
+        'PastAccident': rng.choice(['Yes', 'No', 'Unknown'], n_rows),
+        'AnnualPremium': rng.uniform(100, 5000, n_rows),
+        'Result': np.arange(n_rows) % 2,
+    }).to_csv(path, index=False)
+
+def test_frozen_preprocessor_tracks_processed_data(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Trainer, '_config', None)
+    config = make_config({'random_state': 0})
+    (tmp_path / 'config.yml').write_text(yaml.safe_dump(config))
+    (tmp_path / 'data' / 'processed').mkdir(parents=True)
+    data_path = tmp_path / 'data' / 'processed' / 'latest.csv'
+    write_processed_data(data_path, 40)
+
+    fit_preprocessor = run_path(str(SCRIPTS_DIR / 'fit_preprocessor.py'))
+    assert fit_preprocessor['main']() == 0
+
+    # Same processed data: the saved preprocessor is reused, frozen
+    step = Trainer(config=config).pipeline.named_steps['preprocessor']
+    assert isinstance(step, FunctionTransformer)
+
+    # New rows from a later DAG run: the preprocessor is fitted again
+    write_processed_data(data_path, 60)
+    step = Trainer(config=config).pipeline.named_steps['preprocessor']
+    assert isinstance(step, ColumnTransformer)
@@ -0,0 +1,32 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.data.transformation import Cleaner
+
+def sample_frame(premiums):
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'AnnualPremium': premiums,
+        'Gender': ['Male', np.nan, 'Female', 'Male'],
+        'RegionID': [np.nan, 2, 3, 3],
+        'Age': [30, np.nan, 25, 40],
+        'HasDrivingLicense': [1, np.nan, 1, 1],
+        'Switch': [0, 1, np.nan, 0],
+        'PastAccident': [np.nan, 'Yes', 'No', 'Yes'],
+    })
+
+@pytest.mark.parametrize('premiums', [
+    # Production extracts: currency-formatted text
+    ['£1,200', '£2,500', '£3,000', '£5,000'],
+    # Synthetic extracts: numeric float32
+    np.array([1200, 2500, 3000, 5000], dtype=np.float32),
+])
+def test_cleaned_dtypes_do_not_depend_on_source(premiums):
+    cleaned = Cleaner().clean_data(sample_frame(premiums))
+
+    assert cleaned['AnnualPremium'].dtype == np.float64
+    assert cleaned['Age'].dtype == np.int16
+    assert cleaned['RegionID'].dtype == np.int16
+    assert cleaned['Switch'].dtype == np.int8
+    assert cleaned['Gender'].dtype == 'category'